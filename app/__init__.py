@@ -0,0 +1,4 @@
+import time
+
+# Taken before any other app module is imported, for the startup import time metric
+import_started = time.perf_counter()
@@ -0,0 +1,28 @@
+"""
+Production server launcher.
+
+    python -m app                  # APP_HOST, APP_PORT and APP_WORKERS from the environment
+    python -m app --workers 4 --port 8080
+"""
+
+import argparse
+import sys
+
+from app.core.config import settings
+from app.server import run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default=settings.app_host)
+    parser.add_argument("--port", type=int, default=settings.app_port)
+    parser.add_argument(
+        "--workers", type=int, default=settings.app_workers, help="0 means one per CPU"
+    )
+    args = parser.parse_args()
+
+    sys.exit(run(host=args.host, port=args.port, workers=args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Stream a table to a file or stdout as NDJSON or CSV.
+
+    python -m app.commands.export quotes --format csv --gzip -o quotes.csv.gz
+    python -m app.commands.export applications --status approved --created-from 2026-01-01
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.schemas.export_schema import ExportFilterSchema, ExportFormatEnum, ExportTableEnum
+from app.schemas.polis_schema import ApplicationStatusEnum, TariffEnum
+from app.services.export_service import ExportService
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("table", type=ExportTableEnum, choices=list(ExportTableEnum))
+    parser.add_argument(
+        "--format", type=ExportFormatEnum, choices=list(ExportFormatEnum), default="ndjson"
+    )
+    parser.add_argument("--gzip", action="store_true", help="gzip the output")
+    parser.add_argument("-o", "--output", help="output file, stdout if omitted")
+    parser.add_argument("--created-from", type=datetime.fromisoformat, help="inclusive")
+    parser.add_argument("--created-to", type=datetime.fromisoformat, help="exclusive")
+    parser.add_argument("--tariff", type=TariffEnum, choices=list(TariffEnum))
+    parser.add_argument("--status", type=ApplicationStatusEnum, choices=list(ApplicationStatusEnum))
+    parser.add_argument("--chunk-size", type=int, default=settings.export_chunk_size)
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> None:
+    filters = ExportFilterSchema(
+        created_from=args.created_from,
+        created_to=args.created_to,
+        tariff=args.tariff,
+        status=args.status,
+    )
+    service = ExportService(session_factory=SessionLocal, chunk_size=args.chunk_size)
+    chunks = service.export(args.table, args.format, filters, compress=args.gzip)
+
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        async for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
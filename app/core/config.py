@@ -1,5 +1,6 @@
 from decimal import Decimal
 from functools import lru_cache
+from pathlib import Path
 from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -10,13 +11,55 @@ class Settings(BaseSettings):
 
     # Application
     app_env: Literal["production", "testing", "development"] = "production"
+    app_host: str = "0.0.0.0"
     app_port: int = 8000
+    app_workers: int = 1  # Pre-forked worker processes, 0 means one per CPU
     app_title: str = "Your App Title"
     app_version: str = "1.0.0"
     app_description: str = "Your App Description"
 
+    # Server (python -m app)
+    server_loop: Literal["auto", "uvloop", "asyncio"] = "auto"  # auto: uvloop if installed
+    server_http: Literal["auto", "httptools", "h11"] = "auto"  # auto: httptools if installed
+    server_backlog: int = 2048  # Pending connections queued by the kernel
+    server_keep_alive: int = 5  # Seconds an idle keep-alive connection stays open
+    server_graceful_timeout: int = 30  # Seconds to drain in-flight requests on shutdown
+    server_limit_concurrency: int | None = None  # Connections per worker before 503
+
+    # Logging
+    log_level: str | None = None  # Defaults to DEBUG outside production, INFO in production
+    log_file: str | None = "logs/app.log"
+    log_async: bool = True  # Write log sinks from a background thread
+    log_queue_size: int = 10000  # Lines buffered per sink before dropping
+    log_file_max_bytes: int = 10 * 1024 * 1024
+    log_file_backups: int = 7
+    log_sample_rates: dict[str, float] = {}  # e.g. {"POST /api/v1/quotes": 0.1}
+
     # quote service
-    quote_base_price: Decimal = Decimal("1000")
+    quote_base_price: Decimal = Decimal("1000")  # Used when the rules file sets no base_price
+    quote_batch_max_size: int = 5000  # Max quotes per batch request
+    quote_price_memo_size: int = 4096  # Max memoized price entries per worker
+    quote_cache_ttl: int = 86400  # Cached quote JSON lifetime in seconds
+    quote_cache_negative_ttl: int = 5  # Cached "not found" lifetime in seconds
+    # sync: every quote commits on its own; write_behind: quotes are queued and inserted in
+    # batches by a background task in each worker
+    quote_write_mode: Literal["sync", "write_behind"] = "sync"
+    # commit: answer once the quote's batch commits; enqueue: answer right away, quotes still
+    # queued in a crashed worker are lost
+    quote_write_behind_durability: Literal["commit", "enqueue"] = "commit"
+    quote_write_behind_batch_size: int = 500  # Rows per INSERT transaction
+    quote_write_behind_max_delay_ms: float = 20  # Longest a queued quote waits for its batch
+    quote_write_behind_max_queue: int = 10000  # Queued rows per worker before requests flush
+    application_page_size: int = 20  # Default applications per listing page
+    application_page_max_size: int = 100
+    # Defaults to the rules shipped with the package; a relative path is taken from the cwd
+    pricing_rules_file: str = str(Path(__file__).parent / "pricing_rules.json")
+    pricing_rules_reload_interval: float = 5  # Seconds between rules file checks, 0 disables
+
+    # Export
+    # Admin token for /export over HTTP, sent as X-Export-Token; unset keeps /export off
+    export_api_token: str | None = None
+    export_chunk_size: int = 5000  # Rows fetched and encoded per chunk
 
     # Security
     secret_key: str
@@ -25,10 +68,18 @@ class Settings(BaseSettings):
     refresh_token_expire_days: int = 7
     password_min_length: int = 8
     password_max_length: int = 128
+    password_hash_executor: Literal["thread", "process"] = "thread"
+    password_hash_workers: int = 4  # bcrypt pool size per app worker
+    password_hash_max_queue: int = 32  # Calls allowed to wait before returning 503
+    principal_cache_size: int = 10000  # Max cached authenticated principals per worker
+    # Seconds a changed or deleted user can stay authenticated in other workers
+    principal_cache_ttl: int = 60
+    token_cache_size: int = 10000  # Verified tokens whose claims are kept until exp, per worker
 
     # Rate Limiting
     rate_limit_requests: int = 100  # Max requests
     rate_limit_time_window: int = 60  # Time window in seconds
+    rate_limit_algorithm: Literal["sliding_window", "token_bucket"] = "sliding_window"
 
     # CORS
     cors_origins: list[str] = ["*"]
@@ -42,12 +93,35 @@ class Settings(BaseSettings):
     db_user: str
     db_password: str
     db_name: str
+    db_echo: bool = False  # Log every SQL statement
+    db_pool_size: int = 5  # Persistent connections per worker
+    db_max_overflow: int = 10  # Extra connections allowed under burst
+    db_pool_timeout: float = 30  # Seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # Reconnect connections older than this, in seconds
+    db_pool_pre_ping: bool = True  # Check connections are alive on checkout
+    db_statement_cache_size: int = 100  # asyncpg prepared statements per connection
+    db_slow_query_ms: float = 200  # Log statements slower than this, 0 disables
+    # check_revision: only verify Alembic is at head; create_all: create missing tables
+    # (local development, races between workers); skip: touch nothing
+    db_startup_mode: Literal["check_revision", "create_all", "skip"] = "check_revision"
+    # Read replica for GET /quotes/{id}, GET /applications/{id} and the user lookup behind
+    # authentication. Unset host means every read goes to the primary. Port, name and
+    # credentials default to the primary's.
+    db_read_host: str | None = None
+    db_read_port: int | None = None
+    db_read_name: str | None = None
+    db_read_your_writes_ms: float = 2000  # Reads go to the primary this long after a write
 
     # Cache
     cache_host: str = "localhost"
     cache_port: int = 6379
     cache_db: int = 0
 
+    # Idempotency (Idempotency-Key on POST /quotes and POST /applications)
+    idempotency_ttl: int = 86400  # Stored response lifetime in seconds
+    idempotency_lock_ttl: int = 30  # In-flight claim lifetime in seconds, outlives a request
+    idempotency_wait_timeout: float = 10  # How long a duplicate waits for the first request
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -58,6 +132,16 @@ class Settings(BaseSettings):
         """Constructs the database connection URL."""
         return f"postgresql+asyncpg://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
 
+    @property
+    def read_database_url(self) -> str | None:
+        """Connection URL of the read replica, or None when reads use the primary."""
+        if not self.db_read_host:
+            return None
+
+        port = self.db_read_port or self.db_port
+        name = self.db_read_name or self.db_name
+        return f"postgresql+asyncpg://{self.db_user}:{self.db_password}@{self.db_read_host}:{port}/{name}"
+
     @property
     def app_debug(self) -> bool:
         """Indicates if the application is running in debug mode."""
@@ -0,0 +1,209 @@
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import zipfile
+from contextvars import ContextVar
+from typing import Callable
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.metrics import register_stats
+
+# ASGI scope of the request being handled, set by LogSamplingMiddleware
+request_scope: ContextVar[dict | None] = ContextVar("request_scope", default=None)
+
+_STOP = object()
+
+# (loguru handler id, sink) pairs added by configure_logging
+_background_sinks: list[tuple[int, "BackgroundSink"]] = []
+
+
+class BackgroundSink:
+    """
+    Loguru sink that hands formatted messages to a writer thread through a bounded queue.
+
+    The request path only does a non-blocking ``put``. When the queue is full the message is
+    dropped and counted rather than stalling the event loop on disk or pipe I/O. The writer
+    drains the queue in batches so each write call covers many lines.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        write: Callable[[str], None],
+        max_queue: int,
+        flush_interval: float = 0.05,
+    ):
+        self.name = name
+        self.dropped = 0
+        self._write = write
+        self._flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name=f"log-writer-{name}", daemon=True)
+        self._thread.start()
+
+    def __call__(self, message: str) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if batch[-1] is _STOP:
+                batch.pop()
+                stopping = True
+
+            try:
+                if batch:
+                    self._write("".join(batch))
+            except Exception as e:  # never let a broken sink kill the writer
+                print(f"Log sink {self.name} failed: {e}", file=sys.stderr)
+
+            if not stopping:
+                # Let lines accumulate instead of waking up for every message
+                time.sleep(self._flush_interval)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush queued messages and stop the writer thread."""
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout=timeout)
+
+    def stats(self) -> dict:
+        return {"queued": self._queue.qsize(), "dropped": self.dropped}
+
+
+def _stdout_writer(text: str) -> None:
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+class _RotatingFileWriter:
+    """
+    Appends to a file, rotates it by size in bytes and zips the rotated files
+    (``app.log.1.zip`` is the newest). Only ever called from the writer thread.
+    """
+
+    def __init__(self, path: str, max_bytes: int, backups: int):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._file = open(path, "ab")
+        self._size = self._file.tell()
+
+    def _backup(self, index: int) -> str:
+        return f"{self.path}.{index}.zip"
+
+    def _rotate(self) -> None:
+        self._file.close()
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(self._backup(index)):
+                os.replace(self._backup(index), self._backup(index + 1))
+        if self.backups > 0:
+            with zipfile.ZipFile(self._backup(1), "w", zipfile.ZIP_DEFLATED) as archive:
+                archive.write(self.path, os.path.basename(self.path))
+        self._file = open(self.path, "wb")
+        self._size = 0
+
+    def __call__(self, text: str) -> None:
+        data = text.encode("utf-8")
+        if self._size and self._size + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+
+
+def _sampling_filter(record) -> bool:
+    """
+    Keep a sampled share of INFO lines for routes listed in ``LOG_SAMPLE_RATES``.
+
+    The decision is taken once per request, so a request's INFO lines are kept or dropped
+    together. Other levels are never sampled.
+    """
+    if record["level"].name not in ("INFO", "SUCCESS"):
+        return True
+
+    scope = request_scope.get()
+    if scope is None or "route" not in scope:
+        return True
+
+    sampled = scope.get("log_sampled")
+    if sampled is None:
+        key = f"{scope['method']} {scope['route'].path}"
+        sampled = random.random() < settings.log_sample_rates.get(key, 1.0)
+        scope["log_sampled"] = sampled
+
+    return sampled
+
+
+def configure_logging() -> None:
+    """(Re)configure loguru sinks. Safe to call more than once."""
+    shutdown_logging()
+    logger.remove()
+
+    level = settings.log_level or ("DEBUG" if settings.app_debug else "INFO")
+    log_filter = _sampling_filter if settings.log_sample_rates else None
+
+    if not settings.log_async:
+        logger.add(sys.stdout, level=level, filter=log_filter)
+        if settings.log_file:
+            logger.add(
+                settings.log_file,
+                level=level,
+                filter=log_filter,
+                rotation=settings.log_file_max_bytes,
+                retention=settings.log_file_backups,
+                compression="zip",
+            )
+        return
+
+    sinks = [BackgroundSink("stdout", _stdout_writer, settings.log_queue_size)]
+    if settings.log_file:
+        sinks.append(
+            BackgroundSink(
+                "file",
+                _RotatingFileWriter(
+                    settings.log_file, settings.log_file_max_bytes, settings.log_file_backups
+                ),
+                settings.log_queue_size,
+            )
+        )
+
+    for sink in sinks:
+        handler_id = logger.add(sink, level=level, filter=log_filter, colorize=False)
+        _background_sinks.append((handler_id, sink))
+
+
+def shutdown_logging() -> bool:
+    """
+    Detach, drain and stop background log writers.
+
+    Returns whether any were stopped, in which case loguru is left without sinks.
+    """
+    stopped = bool(_background_sinks)
+    while _background_sinks:
+        handler_id, sink = _background_sinks.pop()
+        logger.remove(handler_id)
+        sink.stop()
+
+    return stopped
+
+
+register_stats("log_sinks", lambda: {sink.name: sink.stats() for _, sink in _background_sinks})
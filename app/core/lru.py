@@ -0,0 +1,60 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class LRUCache:
+    """Bounded in-process LRU cache with optional per-entry expiry and hit/miss counters."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # key -> (value, expires_at as a wall-clock timestamp or None)
+        self._data: OrderedDict[Hashable, tuple[Any, float | None]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value and mark it as recently used."""
+        try:
+            value, expires_at = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        if expires_at is not None and expires_at <= time.time():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, expires_at: float | None = None) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a value and return it."""
+        value, _ = self._data.pop(key, (default, None))
+        return value
+
+    def clear(self) -> None:
+        """Drop all entries. Counters are kept."""
+        self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return size and hit/miss counters."""
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
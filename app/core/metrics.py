@@ -0,0 +1,202 @@
+import re
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
+_stats_providers: dict[str, Callable[[], dict]] = {}
+
+# Upper bounds in seconds, shared by every latency histogram
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Route label for requests that never reached a route (404s, rate-limited requests)
+UNMATCHED_ROUTE = "unmatched"
+
+
+# Filled in by app.main (imports) and startup_application
+startup_timings: dict[str, float] = {"import_ms": 0.0, "startup_ms": 0.0}
+
+
+def register_stats(name: str, provider: Callable[[], dict]) -> None:
+    """Register a callable that returns a snapshot of a component's counters."""
+    _stats_providers[name] = provider
+
+
+def collect_stats() -> dict[str, dict]:
+    """Collect a snapshot from every registered stats provider."""
+    return {name: provider() for name, provider in _stats_providers.items()}
+
+
+register_stats("startup", lambda: dict(startup_timings))
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram.
+
+    Updates are plain attribute and list increments. They only ever run on the event loop
+    thread, so no lock is needed.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RouteMetrics:
+    """Request counters and latency histograms for one method and route template."""
+
+    __slots__ = ("responses", "errors", "latency", "components")
+
+    def __init__(self):
+        self.responses: dict[int, int] = {}
+        self.errors = 0
+        self.latency = Histogram()
+        self.components: dict[str, Histogram] = {}
+
+
+class RequestTimings:
+    """Time spent per component while handling the current request."""
+
+    __slots__ = ("components", "handler_returned")
+
+    def __init__(self):
+        self.components: dict[str, float] = {}
+        # perf_counter() when the endpoint returned, set by TimedRoute
+        self.handler_returned: float | None = None
+
+    def add(self, component: str, seconds: float) -> None:
+        self.components[component] = self.components.get(component, 0.0) + seconds
+
+
+# Timings of the request being handled, set by MetricsMiddleware
+request_timings: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+_route_metrics: dict[tuple[str, str], RouteMetrics] = {}
+
+
+def record_time(component: str, seconds: float) -> None:
+    """Add time spent in a component (db, redis, pricing, ...) to the current request."""
+    timings = request_timings.get()
+    if timings is not None:
+        timings.add(component, seconds)
+
+
+@contextmanager
+def timed(component: str) -> Iterator[None]:
+    """Record the time spent in the block against a component of the current request."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_time(component, time.perf_counter() - started)
+
+
+def observe_request(
+    method: str,
+    route: str,
+    status_code: int,
+    duration: float,
+    components: dict[str, float],
+    failed: bool = False,
+) -> None:
+    """Record a finished request. Components are only observed for requests that used them."""
+    metrics = _route_metrics.get((method, route))
+    if metrics is None:
+        metrics = _route_metrics[(method, route)] = RouteMetrics()
+
+    metrics.responses[status_code] = metrics.responses.get(status_code, 0) + 1
+    if failed or status_code >= 500:
+        metrics.errors += 1
+
+    metrics.latency.observe(duration)
+    for component, seconds in components.items():
+        histogram = metrics.components.get(component)
+        if histogram is None:
+            histogram = metrics.components[component] = Histogram()
+        histogram.observe(seconds)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items())
+
+
+def _render_histogram(lines: list[str], name: str, labels: str, histogram: Histogram) -> None:
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+def _flatten_stats(prefix: str, stats: dict, out: dict[str, float]) -> None:
+    for key, value in stats.items():
+        name = re.sub(r"[^a-zA-Z0-9_]", "_", f"{prefix}_{key}")
+        if isinstance(value, dict):
+            _flatten_stats(name, value, out)
+        elif isinstance(value, (int, float)):  # bools included
+            out[name] = float(value)
+
+
+def render_prometheus() -> str:
+    """Render request metrics and registered component stats in Prometheus text format."""
+    lines = [
+        "# HELP http_requests_total Requests handled, by route template and status code.",
+        "# TYPE http_requests_total counter",
+    ]
+    routes = sorted(_route_metrics.items())
+    for (method, route), metrics in routes:
+        for status_code, count in sorted(metrics.responses.items()):
+            labels = _labels(method=method, route=route, status=status_code)
+            lines.append(f"http_requests_total{{{labels}}} {count}")
+
+    lines += [
+        "# HELP http_request_errors_total Requests that failed with a 5xx or an exception.",
+        "# TYPE http_request_errors_total counter",
+    ]
+    for (method, route), metrics in routes:
+        labels = _labels(method=method, route=route)
+        lines.append(f"http_request_errors_total{{{labels}}} {metrics.errors}")
+
+    lines += [
+        "# HELP http_request_duration_seconds Total request latency.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route), metrics in routes:
+        labels = _labels(method=method, route=route)
+        _render_histogram(lines, "http_request_duration_seconds", labels, metrics.latency)
+
+    lines += [
+        "# HELP http_request_component_seconds Time per request spent in db, redis, pricing "
+        "and serialization, for requests that used the component.",
+        "# TYPE http_request_component_seconds histogram",
+    ]
+    for (method, route), metrics in routes:
+        for component, histogram in sorted(metrics.components.items()):
+            labels = _labels(method=method, route=route, component=component)
+            _render_histogram(lines, "http_request_component_seconds", labels, histogram)
+
+    gauges: dict[str, float] = {}
+    for name, stats in collect_stats().items():
+        _flatten_stats(f"polis_{name}", stats, gauges)
+    for name, value in gauges.items():
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,51 @@
+from decimal import Decimal
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.responses import JSONResponse, Response
+
+from app.core.metrics import timed
+
+try:  # orjson ships with fastapi[all]; fall back to the stdlib encoder without it
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode what orjson does not know natively, the way pydantic's JSON mode does."""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded with orjson, the app's default response class.
+
+    UUID and datetime are handled natively, Decimal is written as a string, as pydantic
+    does. Without orjson installed it behaves like a plain JSONResponse.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+
+        return orjson.dumps(content, default=_default)
+
+
+class ModelResponse(Response):
+    """
+    JSON response for a pydantic model that is already valid.
+
+    The model is encoded once, by pydantic-core straight to bytes. Returning this instead of
+    the model skips FastAPI's validation against the route's return annotation.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        with timed("serialization"):
+            return content.__pydantic_serializer__.to_json(content)
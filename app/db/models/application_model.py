@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Enum
+from sqlalchemy import Column, String, ForeignKey, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -11,6 +11,11 @@ from app.schemas.polis_schema import ApplicationStatusEnum, TariffEnum
 
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        # Serves owner lookups and keyset pagination over (created_at, id) per owner, so
+        # owner_id needs no index of its own
+        Index("ix_applications_owner_id_created_at_id", "owner_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     full_name = Column(String, nullable=False)
@@ -22,11 +27,13 @@ class Application(Base):
         default=TariffEnum.standard,
     )
 
-    quote_id = Column(UUID(as_uuid=True), ForeignKey("quotes.id"), nullable=False)
-    quote = relationship("Quote")
+    # Never lazy-loaded: repositories load these explicitly, so a missed load fails loudly
+    # instead of issuing a hidden query (or MissingGreenlet) on attribute access.
+    quote_id = Column(UUID(as_uuid=True), ForeignKey("quotes.id"), nullable=False, index=True)
+    quote = relationship("Quote", lazy="raise")
 
     owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    owner = relationship("User")
+    owner = relationship("User", lazy="raise")
 
     status = Column(
         Enum(ApplicationStatusEnum, name="application_status_enum"),
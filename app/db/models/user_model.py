@@ -7,11 +7,9 @@ from app.db.session import Base
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, nullable=False
-    )
-    full_name = Column(String(200), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
+    full_name = Column(String(200), nullable=False)
     username = Column(String(50), unique=True, nullable=False, index=True)
-    password = Column(String(255), nullable=False, index=True)
+    password = Column(String(255), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -0,0 +1,66 @@
+import re
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+VERSIONS_DIR = Path(__file__).parent / "migrations" / "versions"
+
+_REVISION = re.compile(r"^revision: str = ['\"](\w+)['\"]", re.MULTILINE)
+_DOWN_REVISION = re.compile(r"^down_revision: .*= (.+)$", re.MULTILINE)
+_REVISION_ID = re.compile(r"['\"](\w+)['\"]")
+
+
+def expected_heads(versions_dir: Path = VERSIONS_DIR) -> set[str]:
+    """
+    Return the head revisions of the migration scripts.
+
+    The revision headers are read as text instead of through Alembic's script directory,
+    which would import Alembic and every migration module into each worker.
+    """
+    revisions: set[str] = set()
+    parents: set[str] = set()
+
+    for path in versions_dir.glob("*.py"):
+        source = path.read_text(encoding="utf-8")
+        revision = _REVISION.search(source)
+        if revision is None:
+            continue
+
+        revisions.add(revision.group(1))
+        down_revision = _DOWN_REVISION.search(source)
+        if down_revision is not None:
+            parents.update(_REVISION_ID.findall(down_revision.group(1)))
+
+    return revisions - parents
+
+
+async def current_heads(engine: AsyncEngine) -> set[str]:
+    """Return the revisions recorded in ``alembic_version``, empty if it does not exist."""
+    async with engine.connect() as conn:
+        try:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        except DBAPIError:
+            return set()
+
+        return set(result.scalars().all())
+
+
+async def check_revision(engine: AsyncEngine) -> str:
+    """
+    Make sure the database is migrated to the head revision. Returns the revision.
+
+    Raises:
+        RuntimeError: If the database is behind, ahead of or diverged from the code.
+    """
+    expected = expected_heads()
+    current = await current_heads(engine)
+
+    if current != expected:
+        raise RuntimeError(
+            f"Database revision {sorted(current) or 'none'} does not match the code "
+            f"({sorted(expected)}); run `alembic upgrade head`"
+        )
+
+    return ", ".join(sorted(current))
@@ -1,10 +1,141 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import time
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
 from app.core.config import settings
+from app.core.metrics import record_time, register_stats
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that also records checkout wait time and checkout timeouts."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.checkout_wait_total += waited
+            self.checkout_wait_max = max(self.checkout_wait_max, waited)
+
 
-engine = create_async_engine(url=settings.database_url, echo=settings.app_debug)
+def pool_stats(engine_local: AsyncEngine) -> dict:
+    """Return live connection pool statistics for an engine."""
+    pool = engine_local.pool
+    stats = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(
+            checkouts=pool.checkouts,
+            checkout_timeouts=pool.checkout_timeouts,
+            checkout_wait_avg_ms=(
+                pool.checkout_wait_total / pool.checkouts * 1000 if pool.checkouts else 0.0
+            ),
+            checkout_wait_max_ms=pool.checkout_wait_max * 1000,
+        )
+
+    return stats
+
+
+def build_engine(url: str) -> AsyncEngine:
+    """Create an engine with the configured pool and statement cache settings."""
+    return create_async_engine(
+        url=url,
+        echo=settings.db_echo,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args={"prepared_statement_cache_size": settings.db_statement_cache_size},
+    )
+
+
+engine = build_engine(settings.database_url)
 SessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
+register_stats("db_pool", lambda: pool_stats(engine))
+
+# Optional replica for read-only routes; without one, reads share the primary's engine
+has_read_replica = settings.read_database_url is not None
+if has_read_replica:
+    read_engine = build_engine(settings.read_database_url)
+    ReadSessionLocal = sessionmaker(bind=read_engine, class_=AsyncSession, expire_on_commit=False)
+    register_stats("db_read_pool", lambda: pool_stats(read_engine))
+else:
+    read_engine = engine
+    ReadSessionLocal = SessionLocal
+
+SLOW_QUERY_SECONDS = settings.db_slow_query_ms / 1000
+SLOW_QUERY_MAX_CHARS = 2000
+
+slow_queries = {"count": 0, "max_ms": 0.0}
+register_stats("db_slow_queries", lambda: dict(slow_queries))
+
+
+def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    context._statement_started = time.perf_counter()
+
+
+def _record_statement_time(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._statement_started
+    record_time("db", elapsed)
+
+    if SLOW_QUERY_SECONDS and elapsed >= SLOW_QUERY_SECONDS:
+        slow_queries["count"] += 1
+        slow_queries["max_ms"] = max(slow_queries["max_ms"], elapsed * 1000)
+        logger.warning(
+            "Slow query ({:.1f} ms): {} params={}",
+            elapsed * 1000,
+            statement[:SLOW_QUERY_MAX_CHARS],
+            parameter_shape(parameters, executemany),
+        )
+
+
+for _engine in {engine, read_engine}:
+    event.listen(_engine.sync_engine, "before_cursor_execute", _start_statement_timer)
+    event.listen(_engine.sync_engine, "after_cursor_execute", _record_statement_time)
+
+
+def parameter_shape(parameters, executemany: bool) -> str:
+    """
+    Describe bound parameters by type only, so the slow-query log never holds user data.
+
+    ``executemany`` batches are reported as the shape of the first row and the row count.
+    """
+    if executemany:
+        rows = list(parameters)
+        return f"{parameter_shape(rows[0], False) if rows else '()'} x {len(rows)}"
+
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+
+    return "(" + ", ".join(type(v).__name__ for v in parameters or ()) + ")"
+
+
 Base = declarative_base()
 
 
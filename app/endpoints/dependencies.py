@@ -1,22 +1,73 @@
-from fastapi import Depends, HTTPException
+import secrets
+from typing import Annotated
+
+from fastapi import Depends, Header, HTTPException, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
-from app.db.models.user_model import User
-from app.db.session import get_session
+from app.core.config import settings
+from app.db.session import ReadSessionLocal, SessionLocal, get_session, has_read_replica
 from app.repositories.application_repository import ApplicationRepository
 from app.repositories.quote_repository import QuoteRepository
 from app.repositories.user_repository import UserRepository
+from app.schemas.auth_schema import UserResponseSchema
 from app.services.application_service import ApplicationService
 from app.services.auth_service import AuthService
+from app.services.export_service import ExportService
+from app.services.principal_cache_service import principal_cache
 from app.services.quote_service import QuoteService
-from app.services.security_service import SecurityService
+from app.services.quote_writer_service import quote_writer
+from app.services.read_routing_service import recent_writers, writer_identity
+from app.services.security_service import SecurityService, token_verifier
 
 bearer_scheme = HTTPBearer()
 
 
+async def get_cache(request: Request):
+    """Dependency to get the application cache."""
+    return request.app.state.cache
+
+
+def client_identity(request: Request) -> str:
+    """
+    The ``writer_identity`` of a request: the user of a valid bearer token, otherwise the
+    client address. Verified tokens are cached, so this is cheap to call on every read.
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    username = None
+    if scheme.lower() == "bearer" and token:
+        payload = token_verifier.decode(token)
+        username = payload.get("sub") if payload else None
+
+    return writer_identity(username, request.client.host if request.client else None)
+
+
+async def records_write(request: Request) -> None:
+    """
+    Dependency for routes that write: once they succeed, ``ReadYourWritesMiddleware`` marks
+    the caller so its reads stay on the primary for the read-your-writes window.
+    """
+    if has_read_replica:
+        request.state.recent_writer = client_identity(request)
+
+
+async def get_read_session(request: Request) -> AsyncSession:
+    """
+    Session for read-only routes: the replica when one is configured, unless this client
+    wrote within the read-your-writes window, in which case the primary.
+    """
+    session_factory = SessionLocal
+    if has_read_replica and not await recent_writers.wrote_recently(
+        request.app.state.cache, client_identity(request)
+    ):
+        session_factory = ReadSessionLocal
+
+    async with session_factory() as session:
+        yield session
+
+
 # Repositories
 async def get_user_repository(session: AsyncSession = Depends(get_session)) -> UserRepository:
     """Factory function to get UserRepository with a database session."""
@@ -24,6 +75,14 @@ async def get_user_repository(session: AsyncSession = Depends(get_session)) -> U
     return UserRepository(session=session)
 
 
+async def get_read_user_repository(
+    session: AsyncSession = Depends(get_read_session),
+) -> UserRepository:
+    """Factory function to get a read-only UserRepository, routed to the replica."""
+    logger.debug("Getting read user repository")
+    return UserRepository(session=session)
+
+
 async def get_quote_repository(
     session: AsyncSession = Depends(get_session),
 ) -> QuoteRepository:
@@ -32,6 +91,14 @@ async def get_quote_repository(
     return QuoteRepository(session=session)
 
 
+async def get_read_quote_repository(
+    session: AsyncSession = Depends(get_read_session),
+) -> QuoteRepository:
+    """Factory function to get a read-only QuoteRepository, routed to the replica."""
+    logger.debug("Getting read quote repository")
+    return QuoteRepository(session=session)
+
+
 async def get_application_repository(
     session: AsyncSession = Depends(get_session),
 ) -> ApplicationRepository:
@@ -40,6 +107,14 @@ async def get_application_repository(
     return ApplicationRepository(session=session)
 
 
+async def get_read_application_repository(
+    session: AsyncSession = Depends(get_read_session),
+) -> ApplicationRepository:
+    """Factory function to get a read-only ApplicationRepository, routed to the replica."""
+    logger.debug("Getting read application repository")
+    return ApplicationRepository(session=session)
+
+
 # Services
 async def get_auth_service(
     user_repository: UserRepository = Depends(get_user_repository),
@@ -58,11 +133,23 @@ async def get_security_service() -> SecurityService:
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
     security_service: SecurityService = Depends(get_security_service),
-    user_repo: UserRepository = Depends(get_user_repository),
-) -> User:
-    """Dependency to get the current authenticated user."""
+    user_repo: UserRepository = Depends(get_read_user_repository),
+) -> UserResponseSchema:
+    """
+    Dependency to get the current authenticated user.
+
+    Principals are cached per token until the token expires, so repeated calls with the
+    same token skip both the JWT decode and the user lookup.
+    """
     logger.debug("Getting current user")
-    username = security_service.verify_token(token=credentials.credentials)
+    token = credentials.credentials
+
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
+    payload = security_service.decode_token(token=token)
+    username = payload.get("sub") if payload else None
 
     if username is None:
         logger.info("Refreshing tokens failed")
@@ -80,15 +167,33 @@ async def get_current_user(
             detail="User not found",
         )
 
-    return user
+    principal = UserResponseSchema(id=user.id, full_name=user.full_name, username=user.username)
+    # Without exp the token never expires on its own, so keep checking the user every time
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        principal_cache.set(token, principal, expires_at=expires_at)
+
+    return principal
 
 
 async def get_quote_service(
     quote_repository: QuoteRepository = Depends(get_quote_repository),
+    cache=Depends(get_cache),
 ) -> QuoteService:
-    """Factory function to get QuoteService with QuoteRepository."""
+    """Factory function to get QuoteService with QuoteRepository and cache."""
     logger.debug("Getting quote service")
-    return QuoteService(quote_repository=quote_repository)
+    writer = quote_writer if settings.quote_write_mode == "write_behind" else None
+    return QuoteService(quote_repository=quote_repository, cache=cache, writer=writer)
+
+
+async def get_quote_read_service(
+    quote_repository: QuoteRepository = Depends(get_read_quote_repository),
+    cache=Depends(get_cache),
+) -> QuoteService:
+    """Factory function to get QuoteService for read-only routes."""
+    logger.debug("Getting quote read service")
+    writer = quote_writer if settings.quote_write_mode == "write_behind" else None
+    return QuoteService(quote_repository=quote_repository, cache=cache, writer=writer)
 
 
 async def get_application_service(
@@ -96,5 +201,36 @@ async def get_application_service(
 ) -> ApplicationService:
     """Factory function to get ApplicationService with ApplicationRepository."""
     logger.debug("Getting application service")
+    writer = quote_writer if settings.quote_write_mode == "write_behind" else None
+    return ApplicationService(application_repository=application_repository, quote_writer=writer)
+
 
+async def get_application_read_service(
+    application_repository: ApplicationRepository = Depends(get_read_application_repository),
+) -> ApplicationService:
+    """Factory function to get ApplicationService for read-only routes."""
+    logger.debug("Getting application read service")
     return ApplicationService(application_repository=application_repository)
+
+
+async def require_export_token(
+    x_export_token: Annotated[str | None, Header()] = None,
+) -> None:
+    """
+    Dependency guarding /export: every row of a table is only served to holders of the admin
+    token, on top of a valid bearer token.
+    """
+    if not settings.export_api_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    if x_export_token is None or not secrets.compare_digest(
+        x_export_token.encode(), settings.export_api_token.encode()
+    ):
+        logger.info("Export refused: missing or wrong export token")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Export not allowed")
+
+
+async def get_export_service() -> ExportService:
+    """Factory function to get ExportService, which opens its own sessions."""
+    logger.debug("Getting export service")
+    return ExportService(session_factory=SessionLocal, chunk_size=settings.export_chunk_size)
@@ -1,53 +1,183 @@
+import time
+
 from loguru import logger
 from starlette import status
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
+from app.core.logging_setup import request_scope
+from app.core.metrics import UNMATCHED_ROUTE, RequestTimings, observe_request, request_timings
+from app.services.read_routing_service import recent_writers
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """Middleware to limit the number of requests from a single IP address."""
 
-    async def dispatch(self, request, call_next):
-        client_ip = request.client.host
-        cache = request.app.state.cache
-        key = f"rate_limit:{client_ip}"
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        request_count = await cache.get(key)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        if request_count is None:
-            logger.debug(f"rate limit request count: {request_count}")
-            await cache.set(key, 1, ttl=settings.rate_limit_time_window)
+        client_ip = scope["client"][0] if scope.get("client") else "unknown"
+        rate_limiter = scope["app"].state.rate_limiter
+        key = f"rate_limit:{client_ip}"
 
-        elif int(request_count) >= settings.rate_limit_requests:
-            logger.info(f"{request_count} requests remaining.")
-            return JSONResponse(
+        result = await rate_limiter.hit(
+            key, limit=settings.rate_limit_requests, window=settings.rate_limit_time_window
+        )
+
+        if not result.allowed:
+            logger.info("Rate limit exceeded for {}, resets in {}s", client_ip, result.reset)
+            response = JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 content={"detail": "Too many requests. Try again later."},
+                headers=result.headers(),
             )
+            await response(scope, receive, send)
+            return
+
+        rate_limit_headers = result.headers()
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(rate_limit_headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Middleware that marks clients after a successful write, so their reads skip the replica.
 
-        else:
-            await cache.increment(key)
+    Only routes that write opt in, through the ``records_write`` dependency, which leaves
+    the writer's identity in the request state.
+    """
 
-        response = await call_next(request)
+    SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
 
-        return response
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in self.SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
 
-class ExceptionMiddleware(BaseHTTPMiddleware):
+        cache = scope["app"].state.cache
+
+        async def send_marking_writer(message: Message) -> None:
+            # Mark before the client sees the response, and with it can issue the next read
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                writer = scope.get("state", {}).get("recent_writer")
+                if writer is not None:
+                    await recent_writers.mark(cache, writer)
+            await send(message)
+
+        await self.app(scope, receive, send_marking_writer)
+
+
+class ExceptionMiddleware:
     """Middleware to handle unhandled exceptions and return a JSON response."""
 
-    async def dispatch(self, request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_tracking_start(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send_tracking_start)
         except Exception as e:
-            logger.exception(f"Unhandled exception: {e}")
+            logger.exception("Unhandled exception: {}", e)
+
+            # Too late to replace the response, let the server close the connection
+            if response_started:
+                raise
 
             detail = str(e) if settings.app_debug else "Internal server error."
 
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content={"detail": detail},
             )
+            await response(scope, receive, send)
+
+
+class LogSamplingMiddleware:
+    """Middleware that exposes the request scope to the per-route log sampling filter."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_scope.reset(token)
+
+
+class MetricsMiddleware:
+    """Middleware that records latency, per-component time and status codes per route."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        failed = False
+
+        async def send_tracking_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if timings.handler_returned is not None:
+                    timings.add("serialization", time.perf_counter() - timings.handler_returned)
+            await send(message)
+
+        token = request_timings.set(timings)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_tracking_status)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            request_timings.reset(token)
+
+            # Set by the router; the template keeps label cardinality bounded
+            route = scope.get("route")
+            observe_request(
+                scope["method"],
+                route.path if route is not None else UNMATCHED_ROUTE,
+                status_code,
+                duration,
+                timings.components,
+                failed=failed,
+            )
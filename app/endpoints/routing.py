@@ -0,0 +1,34 @@
+import inspect
+import time
+from functools import wraps
+
+from fastapi.routing import APIRoute
+
+from app.core.metrics import request_timings
+
+
+class TimedRoute(APIRoute):
+    """
+    Route that marks when its endpoint returns.
+
+    MetricsMiddleware counts the time from there to the start of the response, i.e. response
+    validation, encoding and rendering, as serialization time.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = _mark_return(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _mark_return(endpoint):
+    @wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            timings = request_timings.get()
+            if timings is not None:
+                timings.handler_returned = time.perf_counter()
+
+    return wrapper
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from fastapi import status
 from starlette.responses import JSONResponse
 
+from app.core.responses import ModelResponse
+from app.db.session import has_read_replica
 from app.endpoints.dependencies import get_auth_service
+from app.endpoints.routing import TimedRoute
 from app.schemas.auth_schema import (
     RegisterRequestSchema,
     LoginRequestSchema,
@@ -12,35 +15,55 @@ from app.schemas.auth_schema import (
     RefreshTokenResponse,
 )
 from app.services.auth_service import AuthService
+from app.services.password_hasher_service import PasswordHasherOverloadedError
+from app.services.read_routing_service import writer_identity
 
-router = APIRouter(tags=["Auth"])
+router = APIRouter(tags=["Auth"], route_class=TimedRoute)
+
+
+def _overloaded_response() -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Service is busy. Try again later."},
+        headers={"Retry-After": "1"},
+    )
 
 
 @router.post("/login")
 async def login_endpoint(
     data: LoginRequestSchema, auth_service: AuthService = Depends(get_auth_service)
 ) -> LoginResponseSchema:
-    response = await auth_service.login(data=data)
+    try:
+        response = await auth_service.login(data=data)
+    except PasswordHasherOverloadedError:
+        return _overloaded_response()
 
     if response is None:
         return JSONResponse(
             status_code=status.HTTP_401_UNAUTHORIZED, content={"detail": "Invalid credentials"}
         )
 
-    return response
+    return ModelResponse(response)
 
 
 @router.post("/register")
 async def register_endpoint(
-    data: RegisterRequestSchema, auth_service: AuthService = Depends(get_auth_service)
+    request: Request,
+    data: RegisterRequestSchema,
+    auth_service: AuthService = Depends(get_auth_service),
 ) -> RegisterResponseSchema:
     try:
         response = await auth_service.register(data=data)
-        return response
+        if has_read_replica:
+            # The new user's next reads authenticate with the tokens returned here
+            request.state.recent_writer = writer_identity(data.username, None)
+        return ModelResponse(response)
     except ValueError as e:
         return JSONResponse(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, content={"detail": str(e)}
         )
+    except PasswordHasherOverloadedError:
+        return _overloaded_response()
 
 
 @router.post("/refresh-token")
@@ -55,4 +78,4 @@ async def refresh_token_endpoint(
             content={"detail": "Invalid refresh token"},
         )
 
-    return response
+    return ModelResponse(response)
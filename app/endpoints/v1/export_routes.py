@@ -0,0 +1,42 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from loguru import logger
+from starlette import status
+from starlette.responses import JSONResponse, StreamingResponse
+
+from app.endpoints.dependencies import (
+    get_current_user,
+    get_export_service,
+    require_export_token,
+)
+from app.endpoints.routing import TimedRoute
+from app.schemas.auth_schema import UserResponseSchema
+from app.schemas.export_schema import ExportQuerySchema, ExportTableEnum
+from app.services.export_service import ExportService
+
+router = APIRouter(tags=["Export"], route_class=TimedRoute)
+
+
+@router.get("/{table}", dependencies=[Depends(require_export_token)])
+async def export_table(
+    table: ExportTableEnum,
+    query: Annotated[ExportQuerySchema, Query()],
+    current_user: Annotated[UserResponseSchema, Depends(get_current_user)],
+    export_service: Annotated[ExportService, Depends(get_export_service)],
+) -> StreamingResponse:
+    """Stream every row of a table matching the filters as NDJSON or CSV (admin token only)."""
+    logger.info("User {} exporting {}", current_user.id, table)
+
+    try:
+        chunks = export_service.export(table, query.format, query, compress=query.gzip)
+    except ValueError as e:
+        logger.error("Error exporting {}: {}", table, e)
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(e)})
+
+    filename = export_service.filename(table, query.format, query.gzip)
+    return StreamingResponse(
+        chunks,
+        media_type=export_service.media_type(query.format, query.gzip),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from starlette.responses import PlainTextResponse
+
+from app.core.metrics import collect_stats, render_prometheus
+from app.core.responses import FastJSONResponse
+from app.endpoints.routing import TimedRoute
+
+router = APIRouter(tags=["Metrics"], route_class=TimedRoute)
+
+# Served at the application root, where Prometheus scrapes by default
+prometheus_router = APIRouter(tags=["Metrics"], route_class=TimedRoute)
+
+
+@router.get("")
+async def metrics_endpoint() -> dict[str, dict]:
+    """Return a snapshot of in-process cache and pool counters."""
+    return FastJSONResponse(collect_stats())
+
+
+@prometheus_router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics_endpoint() -> PlainTextResponse:
+    """Return request metrics and component counters in Prometheus text format."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
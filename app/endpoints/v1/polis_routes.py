@@ -1,42 +1,98 @@
+import json
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query
 from loguru import logger
 from starlette import status
 from starlette.requests import Request
-from starlette.responses import JSONResponse
-
-from app.db.models.user_model import User
-from app.endpoints.dependencies import get_quote_service, get_application_service, get_current_user
+from starlette.responses import JSONResponse, Response
+
+from app.core.config import settings
+from app.core.metrics import timed
+from app.core.responses import ModelResponse
+from app.endpoints.dependencies import (
+    get_application_read_service,
+    get_application_service,
+    get_cache,
+    get_current_user,
+    get_quote_read_service,
+    get_quote_service,
+    records_write,
+)
+from app.endpoints.routing import TimedRoute
+from app.schemas.auth_schema import UserResponseSchema
 from app.schemas.polis_schema import (
     QuoteCreateRequestSchema,
     QuoteCreateResponseSchema,
+    QuoteBatchCreateRequestSchema,
+    QuoteBatchCreateResponseSchema,
     ApplicationCreateRequestSchema,
     ApplicationCreateResponseSchema,
+    ApplicationListResponseSchema,
+    ApplicationStatusEnum,
+    TariffEnum,
 )
 from app.services.application_service import ApplicationService
+from app.services.idempotency_service import IDEMPOTENCY_HEADER, idempotency_store
 from app.services.quote_service import QuoteService
 from app.utils import rate_limit
 
-router = APIRouter(tags=["Polis"])
+router = APIRouter(tags=["Polis"], route_class=TimedRoute)
+
+IdempotencyKey = Annotated[
+    str | None,
+    Header(
+        alias=IDEMPOTENCY_HEADER,
+        description="Retries with the same key get the first response back",
+    ),
+]
 
 
-@router.post("/quotes")
+@router.post("/quotes", dependencies=[Depends(records_write)])
 @rate_limit(max_requests=5, time_window=60)
 async def create_quote(
     request: Request,
     data: QuoteCreateRequestSchema,
     quote_service: Annotated[QuoteService, Depends(get_quote_service)],
+    cache=Depends(get_cache),
+    idempotency_key: IdempotencyKey = None,
 ) -> QuoteCreateResponseSchema:
-    """Create a new quote with the provided data."""
-    logger.info(f"Creating new quote with data: {data.model_dump()}")
+    """
+    Create a new quote with the provided data.
+
+    With an ``Idempotency-Key`` header, retries of the same request return the first quote.
+    """
+    logger.info("Creating new quote with data: {}", data)
+
+    async def handler() -> tuple[int, str]:
+        response = await quote_service.create_quote(data)
+        logger.info("Created quote with ID: {}", response.id)
+
+        with timed("serialization"):
+            return status.HTTP_200_OK, response.model_dump_json()
+
+    return await idempotency_store.execute(
+        cache, idempotency_key, scope="quotes", body=data.model_dump_json(), handler=handler
+    )
+
+
+@router.post("/quotes/batch", dependencies=[Depends(records_write)])
+@rate_limit(max_requests=5, time_window=60)
+async def create_quotes_batch(
+    request: Request,
+    data: QuoteBatchCreateRequestSchema,
+    quote_service: Annotated[QuoteService, Depends(get_quote_service)],
+) -> QuoteBatchCreateResponseSchema:
+    """Create many quotes in one call. Results are returned in the input order."""
+    logger.info("Creating batch of {} quotes", len(data.items))
 
-    response = await quote_service.create_quote(data)
+    response = await quote_service.create_quotes(data)
 
-    logger.info(f"Created quote with ID: {response.id}")
+    logger.info("Created batch of {} quotes", len(response.items))
 
-    return response
+    # The batch is already validated, so skip re-validating thousands of items on the way out
+    return ModelResponse(response)
 
 
 @router.get("/quotes/{quote_id}")
@@ -44,59 +100,103 @@ async def create_quote(
 async def get_quote(
     request: Request,
     quote_id: UUID,
-    quote_service: Annotated[QuoteService, Depends(get_quote_service)],
+    quote_service: Annotated[QuoteService, Depends(get_quote_read_service)],
 ) -> QuoteCreateResponseSchema:
     """Retrieve a quote by its ID."""
-    logger.info(f"Getting quote with ID: {quote_id}")
+    logger.info("Getting quote with ID: {}", quote_id)
 
-    response = await quote_service.get_quote_by_id(quote_id)
+    payload = await quote_service.get_quote_json(quote_id)
 
-    if response is None:
-        logger.info(f"No quote with ID: {quote_id}")
+    if payload is None:
+        logger.info("No quote with ID: {}", quote_id)
         return JSONResponse(
             status_code=status.HTTP_404_NOT_FOUND, content={"detail": "Quote not found"}
         )
 
     logger.info("Successfully retrieved quote")
-    return response
+    return Response(content=payload, media_type="application/json")
 
 
-@router.post("/applications")
+@router.post("/applications", dependencies=[Depends(records_write)])
 async def create_application(
     data: ApplicationCreateRequestSchema,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserResponseSchema, Depends(get_current_user)],
     application_service: Annotated[ApplicationService, Depends(get_application_service)],
+    cache=Depends(get_cache),
+    idempotency_key: IdempotencyKey = None,
 ) -> ApplicationCreateResponseSchema:
-    """Create a new application with the provided data."""
-    logger.info(f"Creating new application with data: {data.model_dump()}")
+    """
+    Create a new application with the provided data.
+
+    With an ``Idempotency-Key`` header, retries of the same request return the first
+    application. Keys are scoped to the current user.
+    """
+    logger.info("Creating new application with data: {}", data)
+
+    async def handler() -> tuple[int, str]:
+        try:
+            response = await application_service.create_application(data, owner=current_user)
+        except ValueError as e:
+            logger.error("Error creating application: {}", e)
+            return status.HTTP_400_BAD_REQUEST, json.dumps({"detail": str(e)})
+
+        logger.info("Created application with ID: {}", response.id)
+        with timed("serialization"):
+            return status.HTTP_200_OK, response.model_dump_json()
+
+    return await idempotency_store.execute(
+        cache,
+        idempotency_key,
+        scope=f"applications:{current_user.id}",
+        body=data.model_dump_json(),
+        handler=handler,
+    )
+
+
+@router.get("/applications")
+async def list_applications(
+    current_user: Annotated[UserResponseSchema, Depends(get_current_user)],
+    application_service: Annotated[ApplicationService, Depends(get_application_service)],
+    cursor: str | None = None,
+    limit: Annotated[
+        int, Query(ge=1, le=settings.application_page_max_size)
+    ] = settings.application_page_size,
+    status_filter: Annotated[ApplicationStatusEnum | None, Query(alias="status")] = None,
+    tariff: TariffEnum | None = None,
+) -> ApplicationListResponseSchema:
+    """List the current user's applications, newest first, one cursor page at a time."""
+    logger.info("Listing applications for user: {}", current_user.id)
 
     try:
-        response = await application_service.create_application(data, owner=current_user)
-        logger.info(f"Created application with ID: {response.id}")
-        return response
+        response = await application_service.list_applications(
+            owner=current_user, limit=limit, cursor=cursor, status=status_filter, tariff=tariff
+        )
     except ValueError as e:
-        logger.error(f"Error creating application: {e}")
+        logger.error("Error listing applications: {}", e)
         return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(e)})
 
+    logger.info("Listed {} applications", len(response.items))
+    return ModelResponse(response)
+
 
 @router.get("/applications/{application_id}")
 async def get_application(
     application_id: UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
-    application_service: Annotated[ApplicationService, Depends(get_application_service)],
+    current_user: Annotated[UserResponseSchema, Depends(get_current_user)],
+    application_service: Annotated[ApplicationService, Depends(get_application_read_service)],
 ) -> ApplicationCreateResponseSchema:
     """Retrieve an application by its ID."""
-    logger.info(f"Getting application with ID: {application_id}")
+    logger.info("Getting application with ID: {}", application_id)
 
     response = await application_service.get_application(
         application_id=application_id, owner=current_user
     )
 
     if response is None:
-        logger.info(f"No application with ID: {application_id}")
+        logger.info("No application with ID: {}", application_id)
         return JSONResponse(
             status_code=status.HTTP_404_NOT_FOUND, content={"detail": "Application not found"}
         )
 
     logger.info("Successfully retrieved application")
-    return response
+    return ModelResponse(response)
@@ -1,6 +1,32 @@
+from functools import cache
+
 from loguru import logger
 
 from app.core.config import settings
+from app.core.metrics import record_time
+
+
+async def _record_redis_time(self, client, *args, took: float = 0, **kwargs):
+    record_time("redis", took)
+
+
+@cache
+def redis_timing_plugin_class() -> type:
+    """
+    Build the plugin that adds the time of every cache command to the current request's
+    Redis time.
+
+    aiocache (and redis with it) is imported here rather than at module level, so importing
+    the app does not pay for it.
+    """
+    from aiocache.base import API
+    from aiocache.plugins import BasePlugin
+
+    class RedisTimingPlugin(BasePlugin):
+        pass
+
+    RedisTimingPlugin.add_hook(_record_redis_time, [f"post_{cmd.__name__}" for cmd in API.CMDS])
+    return RedisTimingPlugin
 
 
 async def cache_factory():
@@ -12,4 +38,5 @@ async def cache_factory():
         endpoint=settings.cache_host,
         port=settings.cache_port,
         db=settings.cache_db,
+        plugins=[redis_timing_plugin_class()()],
     )
@@ -1,14 +1,28 @@
+import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from loguru import logger
 from starlette.middleware.cors import CORSMiddleware
 
+from app import import_started
 from app.core.config import settings
-from app.endpoints.middlewares import RateLimitMiddleware, ExceptionMiddleware
+from app.core.metrics import startup_timings
+from app.core.responses import FastJSONResponse
+from app.db.session import has_read_replica
+from app.endpoints.middlewares import (
+    RateLimitMiddleware,
+    ExceptionMiddleware,
+    LogSamplingMiddleware,
+    MetricsMiddleware,
+    ReadYourWritesMiddleware,
+)
 from app.endpoints.v1 import router as v1_router
+from app.endpoints.v1.metrics_routes import prometheus_router
 from app.utils import startup_application, shutdown_application
 
+startup_timings["import_ms"] = (time.perf_counter() - import_started) * 1000
+
 
 @asynccontextmanager
 async def lifespan(app_local: FastAPI):
@@ -31,6 +45,7 @@ app = FastAPI(
     redoc_url="/redoc" if settings.app_debug else None,
     openapi_url="/openapi.json" if settings.app_debug else None,
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 
@@ -42,9 +57,14 @@ app.add_middleware(
     allow_methods=settings.cors_allowed_methods,
     allow_headers=settings.cors_allowed_headers,
 )
+if has_read_replica:
+    app.add_middleware(ReadYourWritesMiddleware)
 app.add_middleware(RateLimitMiddleware)
 app.add_middleware(ExceptionMiddleware)
+app.add_middleware(LogSamplingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 
 # Include API routers
 app.include_router(v1_router, prefix="/api")
+app.include_router(prometheus_router)
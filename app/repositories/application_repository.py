@@ -1,14 +1,23 @@
+import uuid
+from datetime import datetime
 from uuid import UUID
 from typing import Optional
 
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import insert, literal, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, contains_eager, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.db.models.application_model import Application
 from app.db.models.quote_model import Quote
 from app.db.models.user_model import User
-from app.schemas.polis_schema import ApplicationStatusEnum
+from app.schemas.auth_schema import UserResponseSchema
+from app.schemas.polis_schema import ApplicationStatusEnum, TariffEnum
+
+
+# Owner columns loaded alongside applications; the password hash is never loaded
+OWNER_COLUMNS = (User.id, User.full_name, User.username)
 
 
 class ApplicationRepository:
@@ -24,53 +33,113 @@ class ApplicationRepository:
         email: str,
         tariff: str,
         quote_id: UUID,
-        owner: User,
+        owner: UserResponseSchema,
     ) -> Application:
         """
         Create a new application in the database.
 
+        The insert, the quote existence check and loading the quote for the response all
+        happen in one statement: an ``INSERT ... SELECT FROM quotes ... RETURNING`` inside a
+        CTE, joined back to ``quotes``. No row comes back when the quote does not exist.
+
         Raises:
-            ValueError: If user or quote not found.
+            ValueError: If quote not found.
         """
-        logger.debug(f"Creating application for user {owner} with quote {quote_id}")
-
-        await self._get_entity(Quote, quote_id, "Quote")
-
-        application = Application(
-            full_name=full_name,
-            phone=phone,
-            email=email,
-            tariff=tariff,
-            quote_id=quote_id,
-            status=ApplicationStatusEnum.new,
-            owner_id=owner.id,
+        logger.debug("Creating application for user {} with quote {}", owner.id, quote_id)
+
+        columns = Application.__table__.c
+        new_application = (
+            insert(Application)
+            .from_select(
+                ["id", "full_name", "phone", "email", "tariff", "quote_id", "owner_id", "status"],
+                select(
+                    literal(uuid.uuid4(), columns.id.type),
+                    literal(full_name, columns.full_name.type),
+                    literal(phone, columns.phone.type),
+                    literal(email, columns.email.type),
+                    literal(tariff, columns.tariff.type),
+                    Quote.id,
+                    literal(owner.id, columns.owner_id.type),
+                    literal(ApplicationStatusEnum.new, columns.status.type),
+                ).where(Quote.id == quote_id),
+            )
+            .returning(*columns)
+            .cte("new_application")
         )
-        self.session.add(application)
+        inserted = aliased(Application, new_application)
+
+        result = await self.session.execute(
+            select(inserted, Quote).join(Quote, Quote.id == inserted.quote_id)
+        )
+        row = result.first()
+
+        if row is None:
+            await self.session.rollback()
+            logger.error("Quote with ID {} not found.", quote_id)
+            raise ValueError("Quote not found")
+
+        application, quote = row
+        set_committed_value(application, "quote", quote)
         await self.session.commit()
-        await self.session.refresh(application)
 
-        logger.info(f"Application {application.id} created for user {owner.id}")
+        logger.info("Application {} created for user {}", application.id, owner.id)
         return application
 
-    async def get_application(self, application_id: UUID, owner: User) -> Optional[Application]:
-        """Retrieve an application by its ID."""
-        logger.debug(f"Fetching application by ID: {application_id}")
+    async def get_application(
+        self, application_id: UUID, owner: UserResponseSchema
+    ) -> Optional[Application]:
+        """Retrieve an application by its ID, with its quote and owner, in one query."""
+        logger.debug("Fetching application by ID: {}", application_id)
         result = await self.session.execute(
-            select(Application).where(
-                Application.id == application_id, Application.owner_id == owner.id
+            select(Application)
+            .options(
+                joinedload(Application.quote, innerjoin=True),
+                joinedload(Application.owner, innerjoin=True).load_only(*OWNER_COLUMNS),
             )
+            .where(Application.id == application_id, Application.owner_id == owner.id)
         )
         app = result.scalars().first()
         if app:
-            logger.debug(f"Found application {app.id}")
+            logger.debug("Found application {}", app.id)
         else:
-            logger.warning(f"Application {application_id} not found")
+            logger.warning("Application {} not found", application_id)
         return app
 
-    # --- helper method ---
-    async def _get_entity(self, model, entity_id: UUID, name: str):
-        entity = await self.session.get(model, entity_id)
-        if not entity:
-            logger.error(f"{name} with ID {entity_id} not found.")
-            raise ValueError(f"{name} not found")
-        return entity
+    async def list_applications(
+        self,
+        owner: UserResponseSchema,
+        limit: int,
+        after: tuple[datetime, UUID] | None = None,
+        status: ApplicationStatusEnum | None = None,
+        tariff: TariffEnum | None = None,
+    ) -> list[Application]:
+        """
+        List an owner's applications, newest first, with their quotes and owner in one query.
+
+        ``after`` is the ``(created_at, id)`` of the last application of the previous page.
+        The seek uses the ``owner_id, created_at, id`` index, so deep pages cost the same as
+        the first one.
+        """
+        logger.debug("Listing applications for user {} after {}", owner.id, after)
+
+        statement = (
+            select(Application)
+            .join(Application.quote)
+            .join(Application.owner)
+            .options(
+                contains_eager(Application.quote),
+                contains_eager(Application.owner).load_only(*OWNER_COLUMNS),
+            )
+            .where(Application.owner_id == owner.id)
+            .order_by(Application.created_at.desc(), Application.id.desc())
+            .limit(limit)
+        )
+        if after is not None:
+            statement = statement.where(tuple_(Application.created_at, Application.id) < after)
+        if status is not None:
+            statement = statement.where(Application.status == status)
+        if tariff is not None:
+            statement = statement.where(Application.tariff == tariff)
+
+        result = await self.session.execute(statement)
+        return list(result.scalars().all())
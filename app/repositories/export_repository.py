@@ -0,0 +1,62 @@
+from typing import AsyncIterator
+
+from loguru import logger
+from sqlalchemy import Select, Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.application_model import Application
+from app.db.models.quote_model import Quote
+from app.schemas.export_schema import ExportFilterSchema, ExportTableEnum
+
+EXPORT_TABLES: dict[ExportTableEnum, Table] = {
+    ExportTableEnum.quotes: Quote.__table__,
+    ExportTableEnum.applications: Application.__table__,
+}
+
+
+class ExportRepository:
+    """Repository for streaming whole tables out of the database."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    def columns(table: ExportTableEnum) -> list[str]:
+        """Return the exported column names of a table, in output order."""
+        return [column.name for column in EXPORT_TABLES[table].c]
+
+    @staticmethod
+    def build_query(table: ExportTableEnum, filters: ExportFilterSchema) -> Select:
+        """
+        Build the export query with every filter pushed down to SQL.
+
+        Raises:
+            ValueError: If a filter does not apply to the table.
+        """
+        columns = EXPORT_TABLES[table].c
+        statement = select(*columns)
+
+        if filters.created_from is not None:
+            statement = statement.where(columns.created_at >= filters.created_from)
+        if filters.created_to is not None:
+            statement = statement.where(columns.created_at < filters.created_to)
+        if filters.tariff is not None:
+            statement = statement.where(columns.tariff == filters.tariff)
+        if filters.status is not None:
+            if "status" not in columns:
+                raise ValueError(f"{table} cannot be filtered by status")
+            statement = statement.where(columns.status == filters.status)
+
+        return statement
+
+    async def stream_rows(self, statement: Select, chunk_size: int) -> AsyncIterator[list[tuple]]:
+        """
+        Yield plain row tuples in chunks of at most ``chunk_size``.
+
+        Rows are read through a server-side cursor and never become ORM objects, so only one
+        chunk is held in memory at a time.
+        """
+        logger.debug("Streaming export in chunks of {}", chunk_size)
+        result = await self.session.stream(statement.execution_options(yield_per=chunk_size))
+        async for chunk in result.partitions():
+            yield [tuple(row) for row in chunk]
@@ -2,7 +2,7 @@ from decimal import Decimal
 from uuid import UUID
 
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.quote_model import Quote
@@ -14,24 +14,57 @@ class QuoteRepository:
         self.session = session
 
     async def create_quote(
-        self, tariff: TariffEnum, age: int, experience: int, car_type: CarTypeEnum, price: Decimal
+        self,
+        tariff: TariffEnum,
+        age: int,
+        experience: int,
+        car_type: CarTypeEnum,
+        price: Decimal,
+        rule_version: str | None = None,
     ) -> Quote:
-        """Create a new quote in the database."""
-        logger.debug(f"Creating new quote: {tariff}, {age}, {experience}, {car_type}")
-        quote = Quote(
-            tariff=tariff,
-            age=age,
-            experience=experience,
-            car_type=car_type,
-            price=price,
+        """Create a new quote with a single INSERT ... RETURNING."""
+        logger.debug("Creating new quote: {}, {}, {}, {}", tariff, age, experience, car_type)
+        quote = await self.session.scalar(
+            insert(Quote)
+            .values(
+                tariff=tariff,
+                age=age,
+                experience=experience,
+                car_type=car_type,
+                price=price,
+                rule_version=rule_version,
+            )
+            .returning(Quote)
         )
-        self.session.add(quote)
         await self.session.commit()
-        await self.session.refresh(quote)
         return quote
 
+    async def create_quotes(self, rows: list[dict]) -> list[Quote]:
+        """
+        Create many quotes with a multi-row INSERT ... RETURNING.
+
+        Returned quotes are in the same order as ``rows``.
+        """
+        logger.debug("Creating {} quotes in bulk", len(rows))
+        result = await self.session.scalars(
+            insert(Quote).returning(Quote, sort_by_parameter_order=True), rows
+        )
+        quotes = result.all()
+        await self.session.commit()
+        return quotes
+
+    async def insert_quotes(self, rows: list[dict]) -> None:
+        """
+        Insert fully built quote rows (ids and timestamps included) in one transaction.
+
+        Nothing is returned, so the rows go out as multi-row INSERTs without RETURNING.
+        """
+        logger.debug("Inserting {} queued quotes", len(rows))
+        await self.session.execute(insert(Quote), rows)
+        await self.session.commit()
+
     async def get_quote_by_id(self, quote_id: UUID) -> Quote | None:
         """Retrieve a quote by its ID."""
-        logger.debug(f"Fetching quote by ID: {quote_id}")
+        logger.debug("Fetching quote by ID: {}", quote_id)
         result = await self.session.execute(select(Quote).where(Quote.id == quote_id))
         return result.scalars().first()
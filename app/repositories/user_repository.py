@@ -1,5 +1,5 @@
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.user_model import User
@@ -11,15 +11,21 @@ class UserRepository:
 
     async def get_user_by_username(self, username: str) -> User | None:
         """Retrieve a user by their username."""
-        logger.debug(f"Fetching user by username: {username}")
+        logger.debug("Fetching user by username: {}", username)
         result = await self.session.execute(select(User).where(User.username == username))
         return result.scalars().first()
 
+    async def release(self) -> None:
+        """Return the session's connection to the pool; users already loaded stay readable."""
+        await self.session.close()
+
     async def create_user(self, full_name: str, username: str, password: str) -> User:
-        """Create a new user in the database."""
-        logger.debug(f"Creating new user: {full_name}, {username}")
-        user = User(username=username, full_name=full_name, password=password)
-        self.session.add(user)
+        """Create a new user with a single INSERT ... RETURNING."""
+        logger.debug("Creating new user: {}, {}", full_name, username)
+        user = await self.session.scalar(
+            insert(User)
+            .values(username=username, full_name=full_name, password=password)
+            .returning(User)
+        )
         await self.session.commit()
-        await self.session.refresh(user)
         return user
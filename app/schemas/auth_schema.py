@@ -10,6 +10,11 @@ class UserResponseSchema(BaseModel):
     full_name: str
     username: str
 
+    @classmethod
+    def from_row(cls, user) -> "UserResponseSchema":
+        """Build from a loaded ``User``, reading only the public columns."""
+        return cls.model_validate(user, from_attributes=True)
+
 
 class RefreshTokenRequestSchema(BaseModel):
     refresh_token: str
@@ -0,0 +1,43 @@
+from datetime import datetime
+from enum import StrEnum
+
+from pydantic import BaseModel, model_validator
+
+from app.schemas.polis_schema import ApplicationStatusEnum, TariffEnum
+
+
+class ExportTableEnum(StrEnum):
+    quotes = "quotes"
+    applications = "applications"
+
+
+class ExportFormatEnum(StrEnum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class ExportFilterSchema(BaseModel):
+    created_from: datetime | None = None  # Inclusive
+    created_to: datetime | None = None  # Exclusive
+    tariff: TariffEnum | None = None
+    status: ApplicationStatusEnum | None = None  # Applications only
+
+    @model_validator(mode="after")
+    def check_range(self):
+        """Ensure the created_at range is not inverted."""
+        if self.created_from and self.created_to and self.created_from >= self.created_to:
+            raise ValueError("created_from must be earlier than created_to")
+
+        return self
+
+
+class ExportQuerySchema(ExportFilterSchema):
+    """
+    Query string of ``GET /export/{table}``.
+
+    FastAPI only expands a model into query parameters when it is the route's sole query
+    parameter, so the format options live here next to the filters.
+    """
+
+    format: ExportFormatEnum = ExportFormatEnum.ndjson
+    gzip: bool = False
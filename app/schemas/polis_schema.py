@@ -3,8 +3,9 @@ from decimal import Decimal
 from enum import StrEnum
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr, constr
+from pydantic import BaseModel, EmailStr, conlist, constr
 
+from app.core.config import settings
 from app.schemas.auth_schema import UserResponseSchema
 
 
@@ -53,9 +54,32 @@ class QuoteCreateRequestSchema(BaseQuoteSchema): ...
 class QuoteCreateResponseSchema(BaseQuoteSchema):
     id: UUID
     price: Decimal
+    rule_version: str | None = None  # Pricing rules that produced the price, None for older quotes
     created_at: datetime
     updated_at: datetime | None
 
+    @classmethod
+    def from_row(cls, quote) -> "QuoteCreateResponseSchema":
+        """
+        Build from a loaded ``Quote``.
+
+        Every field here is a plain type that pydantic-core checks faster than
+        ``model_construct`` copies it in Python, so unlike applications this one is validated.
+        """
+        return cls.model_validate(quote, from_attributes=True)
+
+
+class QuoteBatchCreateRequestSchema(BaseModel):
+    items: conlist(
+        QuoteCreateRequestSchema,
+        min_length=1,
+        max_length=settings.quote_batch_max_size,
+    )
+
+
+class QuoteBatchCreateResponseSchema(BaseModel):
+    items: list[QuoteCreateResponseSchema]
+
 
 class ApplicationCreateRequestSchema(BaseApplicationSchema):
     quote_id: UUID
@@ -68,3 +92,30 @@ class ApplicationCreateResponseSchema(BaseApplicationSchema):
     status: ApplicationStatusEnum
     created_at: datetime
     updated_at: datetime | None
+
+    @classmethod
+    def from_row(cls, application, owner=None) -> "ApplicationCreateResponseSchema":
+        """
+        Build from a loaded ``Application`` without re-validating what the database returned.
+
+        Re-running the email and phone validators on every read is most of what building an
+        application response used to cost. The quote must be loaded; the owner is taken from
+        ``owner`` if given, otherwise from the loaded relationship.
+        """
+        return cls.model_construct(
+            id=application.id,
+            full_name=application.full_name,
+            phone=application.phone,
+            email=application.email,
+            tariff=application.tariff,
+            quote=QuoteCreateResponseSchema.from_row(application.quote),
+            owner=owner or UserResponseSchema.from_row(application.owner),
+            status=application.status,
+            created_at=application.created_at,
+            updated_at=application.updated_at,
+        )
+
+
+class ApplicationListResponseSchema(BaseModel):
+    items: list[ApplicationCreateResponseSchema]
+    next_cursor: str | None  # Pass back as ``cursor`` for the next page, None on the last page
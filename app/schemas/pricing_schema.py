@@ -0,0 +1,43 @@
+from decimal import Decimal
+
+from pydantic import BaseModel, constr, model_validator
+
+from app.schemas.polis_schema import CarTypeEnum, TariffEnum
+
+
+class PricingBandSchema(BaseModel):
+    below: int | None = None  # Exclusive upper bound, omitted for the last band
+    coeff: Decimal
+
+
+class PricingRulesSchema(BaseModel):
+    version: constr(min_length=1, max_length=64)
+    base_price: Decimal | None = None  # Falls back to settings.quote_base_price
+    tariff: dict[TariffEnum, Decimal]
+    car_type: dict[CarTypeEnum, Decimal]
+    age_bands: list[PricingBandSchema]
+    experience_bands: list[PricingBandSchema]
+
+    @model_validator(mode="after")
+    def check_coverage(self):
+        """Ensure every tariff and car type is priced and bands cover all integers."""
+        for name, enum, coefficients in (
+            ("tariff", TariffEnum, self.tariff),
+            ("car_type", CarTypeEnum, self.car_type),
+        ):
+            missing = set(enum) - set(coefficients)
+            if missing:
+                raise ValueError(f"{name} has no coefficient for {sorted(missing)}")
+
+        for name, bands in (
+            ("age_bands", self.age_bands),
+            ("experience_bands", self.experience_bands),
+        ):
+            if not bands or bands[-1].below is not None:
+                raise ValueError(f"The last of {name} must have no upper bound")
+
+            bounds = [band.below for band in bands[:-1]]
+            if None in bounds or bounds != sorted(set(bounds)) or (bounds and bounds[0] <= 0):
+                raise ValueError(f"{name} bounds must be positive and strictly increasing")
+
+        return self
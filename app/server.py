@@ -0,0 +1,196 @@
+import os
+import signal
+import socket
+import time
+from importlib.util import find_spec
+from typing import NoReturn
+
+import uvicorn
+from loguru import logger
+from uvicorn.server import STARTUP_FAILURE
+
+from app.core.config import settings
+
+RESPAWN_DELAY = 0.1  # Seconds before replacing a crashed worker, doubled per crash in a row
+RESPAWN_MAX_DELAY = 30
+RESPAWN_RESET_AFTER = 60  # A worker up this long resets the crash count
+
+
+def _pick(preferred: str, fallback: str) -> str:
+    """Use ``preferred`` when its package is installed, otherwise ``fallback``."""
+    return preferred if find_spec(preferred) is not None else fallback
+
+
+def _bind(host: str, port: int, backlog: int) -> socket.socket:
+    """Bind the listening socket once, in the parent, so every worker accepts from it."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _server(app, host: str, port: int) -> uvicorn.Server:
+    loop = settings.server_loop
+    if loop == "auto":
+        loop = _pick("uvloop", "asyncio")
+
+    http = settings.server_http
+    if http == "auto":
+        http = _pick("httptools", "h11")
+
+    return uvicorn.Server(
+        uvicorn.Config(
+            app,
+            host=host,
+            port=port,
+            loop=loop,
+            http=http,
+            lifespan="on",
+            backlog=settings.server_backlog,
+            timeout_keep_alive=settings.server_keep_alive,
+            timeout_graceful_shutdown=settings.server_graceful_timeout,
+            limit_concurrency=settings.server_limit_concurrency,
+            access_log=False,  # MetricsMiddleware and the request logs already cover this
+            log_config=None,
+        )
+    )
+
+
+class Supervisor:
+    """
+    Pre-fork supervisor: the app is imported once here, then each worker is forked from it.
+
+    Workers share the preloaded modules copy-on-write and accept from one listening socket.
+    A worker that dies is replaced, after a delay that doubles with each crash in a row. A
+    worker that fails to boot stops the whole server, since its replacements would fail the
+    same way. On SIGTERM/SIGINT every worker is asked to drain and is killed if it is still
+    running after the graceful timeout.
+    """
+
+    def __init__(self, app, sock: socket.socket, workers: int):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.pids: dict[int, float] = {}  # pid -> monotonic start time
+        self.respawns: list[float] = []  # monotonic times at which to start a replacement
+        self.crashes = 0  # consecutive crashes, reset once a worker has stayed up
+        self.exit_code = 0
+        self.stopping = False
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            self._work()
+
+        self.pids[pid] = time.monotonic()
+        logger.info("Started worker {}", pid)
+
+    def _work(self) -> NoReturn:
+        """Body of a forked worker; never returns into the supervisor's loop."""
+        code = 1
+        try:
+            # Leave the supervisor's handlers behind; uvicorn installs its own
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            host, port = self.sock.getsockname()[:2]
+            server = _server(self.app, host, port)
+            server.run(sockets=[self.sock])
+            code = 0 if server.started else STARTUP_FAILURE
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else 1
+        except Exception:
+            logger.exception("Worker {} crashed", os.getpid())
+        finally:
+            os._exit(code)
+
+    def stop(self, signum=None, frame=None) -> None:
+        if self.stopping:
+            return
+
+        self.stopping = True
+        self.respawns.clear()
+        logger.info("Draining {} workers", len(self.pids))
+        for pid in self.pids:
+            os.kill(pid, signal.SIGTERM)
+
+    def reap(self, pid: int, status: int) -> None:
+        started = self.pids.pop(pid)
+        if self.stopping:
+            return
+
+        code = os.waitstatus_to_exitcode(status)
+        if code == STARTUP_FAILURE:
+            logger.error("Worker {} failed to start, stopping the server", pid)
+            self.exit_code = code
+            self.stop()
+            return
+
+        now = time.monotonic()
+        if now - started >= RESPAWN_RESET_AFTER:
+            self.crashes = 0
+        delay = min(RESPAWN_DELAY * 2**self.crashes, RESPAWN_MAX_DELAY)
+        self.crashes += 1
+        logger.error("Worker {} exited with {}, restarting in {:.1f}s", pid, code, delay)
+        self.respawns.append(now + delay)
+
+    def run(self) -> int:
+        """Supervise the workers until they have all exited; returns the process exit code."""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        for _ in range(self.workers):
+            self.spawn()
+
+        deadline = None
+        while self.pids or self.respawns:
+            if self.stopping and deadline is None:
+                deadline = time.monotonic() + settings.server_graceful_timeout + 5
+
+            now = time.monotonic()
+            for due in [due for due in self.respawns if due <= now]:
+                self.respawns.remove(due)
+                self.spawn()
+
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                if self.respawns:
+                    time.sleep(0.1)
+                    continue
+                break
+
+            if pid == 0:
+                if deadline is not None and time.monotonic() > deadline:
+                    for pid in self.pids:
+                        logger.warning("Killing worker {} after the graceful timeout", pid)
+                        os.kill(pid, signal.SIGKILL)
+                    deadline = float("inf")
+                time.sleep(0.1)
+                continue
+
+            self.reap(pid, status)
+
+        return self.exit_code
+
+
+def run(host: str, port: int, workers: int) -> int:
+    """Serve the app, in-process for one worker, pre-forked for more; returns the exit code."""
+    workers = workers or os.cpu_count() or 1
+
+    # Preload: everything the workers need is imported before the first fork
+    from app.main import app
+
+    if workers == 1 or not hasattr(os, "fork"):
+        server = _server(app, host, port)
+        server.run()
+        return 0 if server.started else STARTUP_FAILURE
+
+    sock = _bind(host, port, settings.server_backlog)
+    logger.info("Listening on {}:{} with {} workers", host, port, workers)
+    try:
+        return Supervisor(app, sock, workers).run()
+    finally:
+        sock.close()
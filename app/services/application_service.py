@@ -2,54 +2,89 @@ from uuid import UUID
 
 from loguru import logger
 
-from app.db.models.application_model import Application
-from app.db.models.user_model import User
+from app.core.pagination import decode_cursor, encode_cursor
 from app.repositories.application_repository import ApplicationRepository
+from app.schemas.auth_schema import UserResponseSchema
 from app.schemas.polis_schema import (
     ApplicationCreateRequestSchema,
     ApplicationCreateResponseSchema,
+    ApplicationListResponseSchema,
+    ApplicationStatusEnum,
+    TariffEnum,
 )
+from app.services.quote_writer_service import QuoteWriter
 
 
 class ApplicationService:
-    def __init__(self, application_repository: ApplicationRepository):
+    def __init__(
+        self, application_repository: ApplicationRepository, quote_writer: QuoteWriter | None = None
+    ):
         self._repository = application_repository
+        self._quote_writer = quote_writer
 
     async def create_application(
         self,
         data: ApplicationCreateRequestSchema,
-        owner: User,
+        owner: UserResponseSchema,
     ) -> ApplicationCreateResponseSchema:
         """Create a new application."""
-        logger.info(f"Creating application: {data}")
-
-        application = await self._repository.create_application(*data, owner=owner)
-
-        logger.success(f"Application created with ID: {application.id}")
-        return ApplicationCreateResponseSchema(
-            id=application.id,
-            full_name=application.full_name,
-            phone=application.phone,
-            email=application.email,
-            tariff=application.tariff,
-            quote=application.quote,
-            owner=application.owner,
-            status=application.status,
-            created_at=application.created_at,
-            updated_at=application.updated_at,
-        )
+        logger.info("Creating application: {}", data)
+
+        if self._quote_writer is not None:
+            # The quote may have been created moments ago and still be queued in this worker
+            await self._quote_writer.wait_for(data.quote_id)
+
+        application = await self._repository.create_application(**data.model_dump(), owner=owner)
 
-    async def get_application(self, application_id: UUID, owner: User) -> Application | None:
-        """Retrieve an application by quote ID."""
-        logger.info(f"Retrieving application: {application_id}, owner ID: {owner.id}")
+        logger.success("Application created with ID: {}", application.id)
+        return ApplicationCreateResponseSchema.from_row(application, owner=owner)
+
+    async def get_application(
+        self, application_id: UUID, owner: UserResponseSchema
+    ) -> ApplicationCreateResponseSchema | None:
+        """Retrieve an application by its ID. Returns None if not found."""
+        logger.info("Retrieving application: {}, owner ID: {}", application_id, owner.id)
 
         application = await self._repository.get_application(
             application_id=application_id, owner=owner
         )
 
-        if application:
-            logger.success(f"Application found with ID: {application.id}")
-        else:
-            logger.warning(f"No application found: {application_id}")
+        if application is None:
+            logger.warning("No application found: {}", application_id)
+            return None
+
+        logger.success("Application found with ID: {}", application.id)
+        return ApplicationCreateResponseSchema.from_row(application)
+
+    async def list_applications(
+        self,
+        owner: UserResponseSchema,
+        limit: int,
+        cursor: str | None = None,
+        status: ApplicationStatusEnum | None = None,
+        tariff: TariffEnum | None = None,
+    ) -> ApplicationListResponseSchema:
+        """
+        List the owner's applications one page at a time, newest first.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        logger.info("Listing applications for owner ID: {}", owner.id)
+        after = decode_cursor(cursor) if cursor else None
+
+        # One extra row tells whether there is a next page
+        applications = await self._repository.list_applications(
+            owner=owner, limit=limit + 1, after=after, status=status, tariff=tariff
+        )
+        has_more = len(applications) > limit
+        applications = applications[:limit]
+
+        items = [ApplicationCreateResponseSchema.from_row(row) for row in applications]
+        last = applications[-1] if has_more else None
 
-        return application
+        logger.success("Listed {} applications for owner ID: {}", len(items), owner.id)
+        return ApplicationListResponseSchema.model_construct(
+            items=items,
+            next_cursor=encode_cursor(last.created_at, last.id) if last else None,
+        )
@@ -24,11 +24,14 @@ class AuthService(SecurityService):
         existing_user = await self._repository.get_user_by_username(username=data.username)
 
         if existing_user:
-            logger.info(f"User {existing_user.username} already registered.")
+            logger.info("User {} already registered.", existing_user.username)
             raise ValueError(f"User {data.username} already exists")
 
+        # Free the DB connection while waiting on the hashing pool
+        await self._repository.release()
+
         # Hash the password and create the user
-        hashed_password = self._get_password_hash(password=data.password)
+        hashed_password = await self._get_password_hash(password=data.password)
 
         # Create user in the repository
         user = await self._repository.create_user(
@@ -53,11 +56,14 @@ class AuthService(SecurityService):
         # Retrieve user by username
         user = await self._repository.get_user_by_username(username=data.username)
 
-        if not user or not self._verify_password(
+        # Free the DB connection while waiting on the hashing pool
+        await self._repository.release()
+
+        if not user or not await self._verify_password(
             plain_password=data.password,
             hashed_password=user.password,
         ):
-            logger.info(f"User {data.username} not found.")
+            logger.info("User {} not found.", data.username)
             return None
 
         logger.debug("Generating new tokens")
@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from decimal import Decimal
+from typing import AsyncIterator, Callable
+from uuid import UUID
+
+from loguru import logger
+from sqlalchemy import Select
+
+from app.repositories.export_repository import ExportRepository
+from app.schemas.export_schema import ExportFilterSchema, ExportFormatEnum, ExportTableEnum
+
+MEDIA_TYPES = {
+    ExportFormatEnum.ndjson: "application/x-ndjson",
+    ExportFormatEnum.csv: "text/csv",
+}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    raise TypeError(f"Cannot export {type(value).__name__}")
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class ExportService:
+    """
+    Service for streaming tables as NDJSON or CSV, optionally gzipped.
+
+    Each export opens its own session, because the stream outlives the request handler
+    that starts it.
+    """
+
+    def __init__(self, session_factory: Callable, chunk_size: int):
+        self._session_factory = session_factory
+        self._chunk_size = chunk_size
+
+    @staticmethod
+    def filename(table: ExportTableEnum, fmt: ExportFormatEnum, compress: bool) -> str:
+        return f"{table}.{fmt}.gz" if compress else f"{table}.{fmt}"
+
+    @staticmethod
+    def media_type(fmt: ExportFormatEnum, compress: bool) -> str:
+        return "application/gzip" if compress else MEDIA_TYPES[fmt]
+
+    def export(
+        self,
+        table: ExportTableEnum,
+        fmt: ExportFormatEnum,
+        filters: ExportFilterSchema,
+        compress: bool = False,
+    ) -> AsyncIterator[bytes]:
+        """
+        Return an iterator of encoded chunks for a table.
+
+        The query is built up front, so invalid filters fail before anything is streamed.
+
+        Raises:
+            ValueError: If a filter does not apply to the table.
+        """
+        statement = ExportRepository.build_query(table, filters)
+        logger.info("Exporting {} as {} (gzip={}) with {}", table, fmt, compress, filters)
+
+        chunks = self._encode(table, fmt, statement)
+        return self._gzip(chunks) if compress else chunks
+
+    async def _encode(
+        self, table: ExportTableEnum, fmt: ExportFormatEnum, statement: Select
+    ) -> AsyncIterator[bytes]:
+        names = ExportRepository.columns(table)
+        rows = 0
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if fmt == ExportFormatEnum.csv:
+            writer.writerow(names)
+            yield buffer.getvalue().encode()
+
+        async with self._session_factory() as session:
+            async for chunk in ExportRepository(session).stream_rows(statement, self._chunk_size):
+                if fmt == ExportFormatEnum.csv:
+                    buffer.seek(0)
+                    buffer.truncate()
+                    writer.writerows([_csv_value(value) for value in row] for row in chunk)
+                    payload = buffer.getvalue()
+                else:
+                    payload = "".join(
+                        json.dumps(dict(zip(names, row)), default=_json_default) + "\n"
+                        for row in chunk
+                    )
+
+                rows += len(chunk)
+                yield payload.encode()
+
+        logger.success("Exported {} rows from {}", rows, table)
+
+    @staticmethod
+    async def _gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        compressor = zlib.compressobj(wbits=31)  # 31 selects the gzip container
+
+        async for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+
+        yield compressor.flush()
@@ -0,0 +1,210 @@
+import asyncio
+import hashlib
+import time
+from typing import Awaitable, Callable
+
+from loguru import logger
+from starlette import status
+from starlette.responses import JSONResponse, Response
+
+from app.core.config import settings
+from app.core.metrics import register_stats
+
+# Header clients send, and the one marking a stored response played back
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+PENDING = "pending"
+
+# Handler producing the status code and the JSON body of the first response
+Handler = Callable[[], Awaitable[tuple[int, str]]]
+
+
+def _raw(value):
+    """Pass stored records through aiocache without re-serializing them."""
+    return value
+
+
+class IdempotencyStore:
+    """
+    Stores the first response to each ``Idempotency-Key`` and replays it for retries.
+
+    The first request claims the key with an atomic add of a pending marker. Its 2xx
+    response is then stored as ``"<fingerprint> <status>\\n<body>"``. Retries with the same
+    key and request fingerprint get the stored body back without running the handler. A
+    retry that arrives while the first request is still running waits for it: on a local
+    future if both are in this worker, otherwise by polling the record.
+
+    Responses other than 2xx release the key so the client can retry. If the cache fails,
+    requests run as if they had no key.
+    """
+
+    def __init__(self, ttl: int, lock_ttl: int, wait_timeout: float, poll_interval: float = 0.05):
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.executed = 0
+        self.replayed = 0
+        self.waited = 0
+        self.conflicts = 0
+        self.errors = 0
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def fingerprint(scope: str, body: str) -> str:
+        """Digest of what makes two requests the same: the endpoint scope and the body."""
+        return hashlib.sha256(f"{scope}\n{body}".encode()).hexdigest()[:32]
+
+    async def execute(
+        self, cache, key: str | None, scope: str, body: str, handler: Handler
+    ) -> Response:
+        """Run ``handler`` once per idempotency key and replay its response afterwards."""
+        if key is None:
+            return self._response(*await handler())
+
+        if not 0 < len(key) <= IDEMPOTENCY_KEY_MAX_LENGTH:
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"detail": f"{IDEMPOTENCY_HEADER} must be 1-255 characters"},
+            )
+
+        cache_key = f"idempotency:{scope}:{key}"
+        fingerprint = self.fingerprint(scope, body)
+
+        try:
+            claimed = await self._claim(cache, cache_key, fingerprint)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Idempotency store unavailable, running request once more: {}", e)
+            return self._response(*await handler())
+
+        if claimed:
+            return await self._run(cache, cache_key, fingerprint, handler)
+
+        return await self._replay(cache, cache_key, fingerprint)
+
+    async def _claim(self, cache, cache_key: str, fingerprint: str) -> bool:
+        try:
+            await cache.add(cache_key, f"{fingerprint} {PENDING}", ttl=self.lock_ttl, dumps_fn=_raw)
+        except ValueError:  # the key already exists
+            return False
+
+        return True
+
+    async def _run(self, cache, cache_key: str, fingerprint: str, handler: Handler) -> Response:
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[cache_key] = future
+        self.executed += 1
+
+        try:
+            status_code, body = await handler()
+        except BaseException:
+            await self._release(cache, cache_key)
+            future.set_result(None)
+            raise
+        finally:
+            self._in_flight.pop(cache_key, None)
+
+        if 200 <= status_code < 300:
+            try:
+                await cache.set(
+                    cache_key, f"{fingerprint} {status_code}\n{body}", ttl=self.ttl, dumps_fn=_raw
+                )
+            except Exception as e:
+                self.errors += 1
+                logger.warning("Failed to store idempotent response: {}", e)
+            future.set_result((fingerprint, status_code, body))
+        else:
+            await self._release(cache, cache_key)
+            future.set_result(None)
+
+        return self._response(status_code, body)
+
+    async def _release(self, cache, cache_key: str) -> None:
+        try:
+            await cache.delete(cache_key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Failed to release idempotency key: {}", e)
+
+    async def _replay(self, cache, cache_key: str, fingerprint: str) -> Response:
+        record = await self._wait(cache, cache_key)
+
+        if record is None:
+            self.conflicts += 1
+            return JSONResponse(
+                status_code=status.HTTP_409_CONFLICT,
+                content={"detail": "The first request with this Idempotency-Key has not completed"},
+            )
+
+        stored_fingerprint, status_code, body = record
+        if stored_fingerprint != fingerprint:
+            self.conflicts += 1
+            return JSONResponse(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                content={"detail": "Idempotency-Key was already used for a different request"},
+            )
+
+        self.replayed += 1
+        logger.info("Replaying stored response for {}", cache_key)
+        return self._response(status_code, body, headers={REPLAYED_HEADER: "true"})
+
+    async def _wait(self, cache, cache_key: str) -> tuple[str, int, str] | None:
+        """Wait for the first request to finish. Returns None if it does not in time."""
+        future = self._in_flight.get(cache_key)
+        if future is not None:
+            self.waited += 1
+            try:
+                record = await asyncio.wait_for(asyncio.shield(future), self.wait_timeout)
+            except asyncio.TimeoutError:
+                return None
+            if record is not None:
+                return record
+
+        deadline = time.monotonic() + self.wait_timeout
+        delay = self.poll_interval
+        while True:
+            value = await cache.get(cache_key, loads_fn=_raw)
+            if value is not None:
+                head, _, body = value.partition("\n")
+                stored_fingerprint, _, state = head.partition(" ")
+                if state != PENDING:
+                    return stored_fingerprint, int(state), body
+            elif future is not None:
+                # The local request failed and released the key; tell the client to retry
+                return None
+
+            if time.monotonic() + delay > deadline:
+                return None
+
+            self.waited += future is None
+            future = None
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+
+    @staticmethod
+    def _response(status_code: int, body: str, headers: dict | None = None) -> Response:
+        return Response(
+            content=body, status_code=status_code, media_type="application/json", headers=headers
+        )
+
+    def stats(self) -> dict:
+        return {
+            "executed": self.executed,
+            "replayed": self.replayed,
+            "waited": self.waited,
+            "conflicts": self.conflicts,
+            "errors": self.errors,
+            "in_flight": len(self._in_flight),
+        }
+
+
+idempotency_store = IdempotencyStore(
+    ttl=settings.idempotency_ttl,
+    lock_ttl=settings.idempotency_lock_ttl,
+    wait_timeout=settings.idempotency_wait_timeout,
+)
+register_stats("idempotency", idempotency_store.stats)
@@ -0,0 +1,119 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cache
+from typing import Literal
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.metrics import register_stats
+
+
+@cache
+def pwd_context():
+    """Build the passlib context on first use, in whichever process does the hashing."""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class PasswordHasherOverloadedError(Exception):
+    """Raised when the password hashing pool and its queue are full."""
+
+
+def _hash_password(password: str) -> str:
+    return pwd_context().hash(password)
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context().verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt off the event loop on a bounded thread or process pool.
+
+    At most ``workers + max_queue`` calls are admitted at once; anything beyond that fails
+    fast with ``PasswordHasherOverloadedError`` instead of queuing without bound.
+    """
+
+    def __init__(self, executor: Literal["thread", "process"], workers: int, max_queue: int):
+        self.executor_kind = executor
+        self.workers = workers
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            logger.info("Starting password hashing {} pool ({})", self.executor_kind, self.workers)
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hasher"
+                )
+
+        return self._executor
+
+    async def _run(self, fn, *args):
+        if self.in_flight >= self.workers + self.max_queue:
+            self.rejected += 1
+            logger.warning("Password hashing pool overloaded ({} in flight)", self.in_flight)
+            raise PasswordHasherOverloadedError("Password hashing is overloaded")
+
+        self.in_flight += 1
+        started = time.perf_counter()
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.in_flight -= 1
+            self.completed += 1
+            self.latency_total += elapsed
+            self.latency_max = max(self.latency_max, elapsed)
+
+    async def hash(self, password: str) -> str:
+        """Hash a plain password on the pool."""
+        return await self._run(_hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a plain password against a hash on the pool."""
+        return await self._run(_verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        """Stop the pool, waiting for running calls to finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        """Return pool depth, rejection and latency counters."""
+        return {
+            "executor": self.executor_kind,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "latency_avg_ms": (
+                self.latency_total / self.completed * 1000 if self.completed else 0.0
+            ),
+            "latency_max_ms": self.latency_max * 1000,
+        }
+
+
+password_hasher = PasswordHasher(
+    executor=settings.password_hash_executor,
+    workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue,
+)
+register_stats("password_hasher", password_hasher.stats)
@@ -0,0 +1,264 @@
+import asyncio
+import hashlib
+import json
+import os
+from decimal import Decimal, ROUND_HALF_UP
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.lru import LRUCache
+from app.core.metrics import register_stats
+from app.schemas.polis_schema import TariffEnum, CarTypeEnum
+from app.schemas.pricing_schema import PricingRulesSchema
+
+PRICE_QUANT = Decimal("0.01")
+
+
+class PricingEngine:
+    """
+    Quote prices precompiled into a flat table over tariff x car type x age band x
+    experience band.
+
+    Every cell already holds the rounded ``base_price * tariff * car * age * experience``
+    product, so pricing is a few integer additions and one tuple lookup.
+
+    Bands are ``(exclusive upper bound, coefficient)`` pairs; the last band has no upper bound.
+    """
+
+    def __init__(
+        self,
+        base_price: Decimal,
+        tariff_coeff: dict[TariffEnum, Decimal],
+        car_coeff: dict[CarTypeEnum, Decimal],
+        age_bands: tuple[tuple[int | None, Decimal], ...],
+        experience_bands: tuple[tuple[int | None, Decimal], ...],
+        version: str = "",
+    ):
+        self.base_price = base_price
+        self.version = version
+
+        n_age = len(age_bands)
+        n_experience = len(experience_bands)
+        car_stride = n_age * n_experience
+        tariff_stride = len(car_coeff) * car_stride
+
+        # Offsets are pre-multiplied by their stride so a lookup is a plain sum.
+        self._tariff_offset = {tariff: i * tariff_stride for i, tariff in enumerate(tariff_coeff)}
+        self._car_offset = {car_type: i * car_stride for i, car_type in enumerate(car_coeff)}
+        (
+            self._age_offsets,
+            self._age_head,
+            self._age_tail,
+        ) = self._compile_bands(age_bands, stride=n_experience)
+        (
+            self._experience_offsets,
+            self._experience_head,
+            self._experience_tail,
+        ) = self._compile_bands(experience_bands, stride=1)
+
+        table = []
+        for tariff_value in tariff_coeff.values():
+            for car_value in car_coeff.values():
+                for _, age_value in age_bands:
+                    for _, experience_value in experience_bands:
+                        price = base_price
+                        price *= tariff_value
+                        price *= age_value
+                        price *= experience_value
+                        price *= car_value
+                        table.append(price.quantize(PRICE_QUANT, rounding=ROUND_HALF_UP))
+
+        self._table = tuple(table)
+
+        # Changes whenever the base price or any coefficient changes
+        self.fingerprint = hashlib.sha256(
+            repr((base_price, tariff_coeff, car_coeff, age_bands, experience_bands)).encode()
+        ).hexdigest()[:16]
+
+        logger.info(
+            "Compiled pricing rules {} ({}) into {} cells",
+            version,
+            self.fingerprint,
+            len(self._table),
+        )
+
+    @classmethod
+    def from_rules(
+        cls, rules: PricingRulesSchema, base_price: Decimal | None = None
+    ) -> "PricingEngine":
+        """Compile validated pricing rules. ``base_price`` overrides the one in the rules."""
+        if base_price is None:
+            base_price = rules.base_price
+        if base_price is None:
+            base_price = settings.quote_base_price
+
+        return cls(
+            base_price=base_price,
+            tariff_coeff=rules.tariff,
+            car_coeff=rules.car_type,
+            age_bands=tuple((band.below, band.coeff) for band in rules.age_bands),
+            experience_bands=tuple((band.below, band.coeff) for band in rules.experience_bands),
+            version=rules.version,
+        )
+
+    @staticmethod
+    def _compile_bands(bands: tuple, stride: int) -> tuple[tuple[int, ...], int, int]:
+        """
+        Expand bands into a per-value offset list covering ``0..last bound``.
+
+        Returns the list plus the offsets for values below zero and past the last bound.
+        """
+        offsets = []
+        for i, (upper, _) in enumerate(bands[:-1]):
+            offsets.extend([i * stride] * (upper - len(offsets)))
+
+        tail = (len(bands) - 1) * stride
+        return tuple(offsets), offsets[0] if offsets else tail, tail
+
+    def price(
+        self, tariff: TariffEnum, age: int, experience: int, car_type: CarTypeEnum
+    ) -> Decimal:
+        """Return the precomputed price for the given quote inputs."""
+        ages = self._age_offsets
+        if age >= len(ages):
+            age_offset = self._age_tail
+        elif age < 0:
+            age_offset = self._age_head
+        else:
+            age_offset = ages[age]
+
+        experiences = self._experience_offsets
+        if experience >= len(experiences):
+            experience_offset = self._experience_tail
+        elif experience < 0:
+            experience_offset = self._experience_head
+        else:
+            experience_offset = experiences[experience]
+
+        return self._table[
+            self._tariff_offset[tariff]
+            + self._car_offset[car_type]
+            + age_offset
+            + experience_offset
+        ]
+
+
+def load_pricing_rules(path: str) -> PricingRulesSchema:
+    """Read and validate a pricing rules file."""
+    with open(path, encoding="utf-8") as f:
+        return PricingRulesSchema.model_validate(json.load(f))
+
+
+class PricingRules:
+    """
+    Holder of the live ``PricingEngine``, reloaded from the rules file when it changes.
+
+    New rules are parsed and compiled off the event loop and published with a single
+    attribute assignment, so in-flight requests keep the engine they started with. Nothing
+    is read at import: ``startup_application`` calls ``load``, and the first use of
+    ``engine`` loads the file if nothing has yet.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.reloads = 0
+        self.reload_errors = 0
+        self._mtime = None
+        self._engine: PricingEngine | None = None
+
+    @property
+    def engine(self) -> PricingEngine:
+        """The live engine."""
+        return self._engine or self.load()
+
+    def load(self) -> PricingEngine:
+        """Read and compile the rules file, raising if it is missing or invalid."""
+        mtime = os.stat(self.path).st_mtime_ns
+        self._engine = PricingEngine.from_rules(load_pricing_rules(self.path))
+        self._mtime = mtime
+        return self._engine
+
+    async def reload(self, force: bool = False) -> bool:
+        """Recompile the rules if the file changed. Returns True if a new engine is live."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            if not force and mtime == self._mtime:
+                return False
+
+            # A broken file is reported once, not on every poll
+            self._mtime = mtime
+            rules = await asyncio.to_thread(load_pricing_rules, self.path)
+            engine = await asyncio.to_thread(PricingEngine.from_rules, rules)
+        except Exception as e:
+            self.reload_errors += 1
+            logger.error("Failed to reload pricing rules from {}: {}", self.path, e)
+            return False
+
+        self._engine = engine
+        self.reloads += 1
+        logger.success("Pricing rules {} are live", engine.version)
+        return True
+
+    async def watch(self, interval: float) -> None:
+        """Poll the rules file every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            await self.reload()
+
+    def stats(self) -> dict:
+        """Return the live rule version and reload counters."""
+        return {
+            "version": self.engine.version,
+            "fingerprint": self.engine.fingerprint,
+            "reloads": self.reloads,
+            "reload_errors": self.reload_errors,
+        }
+
+
+class QuotePriceMemo:
+    """
+    Bounded per-worker memo of quote prices keyed by the quote inputs.
+
+    Entries are dropped as soon as the engine fingerprint changes, so a new base price or
+    coefficient set is never served stale prices.
+    """
+
+    def __init__(self, maxsize: int):
+        self._local = LRUCache(maxsize=maxsize)
+        self._fingerprint = None
+
+    def price(
+        self,
+        engine: PricingEngine,
+        tariff: TariffEnum,
+        age: int,
+        experience: int,
+        car_type: CarTypeEnum,
+    ) -> Decimal:
+        """Return the price from the memo, or from the engine on a miss."""
+        if engine.fingerprint != self._fingerprint:
+            logger.info("Pricing changed to {}, clearing price memo", engine.fingerprint)
+            self._local.clear()
+            self._fingerprint = engine.fingerprint
+
+        key = (tariff, age, experience, car_type)
+        price = self._local.get(key)
+        if price is not None:
+            return price
+
+        # A miss is one lookup in the compiled table, far cheaper than any shared cache
+        price = engine.price(tariff, age, experience, car_type)
+        self._local.set(key, price)
+        return price
+
+    def stats(self) -> dict:
+        """Return hit/miss counters."""
+        return {**self._local.stats(), "fingerprint": self._fingerprint}
+
+
+pricing_rules = PricingRules(settings.pricing_rules_file)
+register_stats("pricing_rules", pricing_rules.stats)
+
+quote_price_memo = QuotePriceMemo(maxsize=settings.quote_price_memo_size)
+register_stats("quote_price_memo", quote_price_memo.stats)
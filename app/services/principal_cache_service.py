@@ -0,0 +1,76 @@
+import hashlib
+import time
+
+from loguru import logger
+from sqlalchemy import event, inspect
+
+from app.core.config import settings
+from app.core.lru import LRUCache
+from app.core.metrics import register_stats
+from app.db.models.user_model import User
+from app.schemas.auth_schema import UserResponseSchema
+
+
+class PrincipalCache:
+    """
+    Per-worker cache of authenticated principals keyed by a digest of the bearer token.
+
+    Entries never outlive the token's ``exp`` claim or the TTL. Invalidating a user bumps
+    its generation, which turns every cached entry for that user into a miss in this worker.
+    Other workers keep serving theirs until the TTL passes, as they do for a user changed
+    outside the ORM; the TTL is that staleness window.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.ttl = ttl
+        self._entries = LRUCache(maxsize=maxsize)
+        self._generations: dict[str, int] = {}
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> UserResponseSchema | None:
+        """Return the cached principal for a token, if any."""
+        digest = self._digest(token)
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+
+        principal, generation = entry
+        if generation != self._generations.get(principal.username, 0):
+            self._entries.pop(digest)
+            return None
+
+        return principal
+
+    def set(self, token: str, principal: UserResponseSchema, expires_at: float) -> None:
+        """Cache a principal until the token expires or the TTL passes, whichever is first."""
+        expires_at = min(expires_at, time.time() + self.ttl)
+        generation = self._generations.get(principal.username, 0)
+        self._entries.set(self._digest(token), (principal, generation), expires_at=expires_at)
+
+    def invalidate_user(self, username: str) -> None:
+        """Drop every cached principal for a user."""
+        logger.debug("Invalidating cached principals for {}", username)
+        self._generations[username] = self._generations.get(username, 0) + 1
+
+    def stats(self) -> dict:
+        """Return size and hit/miss counters."""
+        return self._entries.stats()
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.principal_cache_size,
+    ttl=settings.principal_cache_ttl,
+)
+register_stats("principal_cache", principal_cache.stats)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: User) -> None:
+    """Invalidate cached principals whenever a user row is changed through the ORM."""
+    previous_usernames = inspect(target).attrs.username.history.deleted or ()
+    for username in {target.username, *previous_usernames}:
+        principal_cache.invalidate_user(username)
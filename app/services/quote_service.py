@@ -1,112 +1,232 @@
-from decimal import Decimal, ROUND_HALF_UP
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from functools import partial
 from uuid import UUID
 
 from loguru import logger
 
 from app.core.config import settings
+from app.core.metrics import timed
 from app.repositories.quote_repository import QuoteRepository
-from app.schemas.polis_schema import QuoteCreateRequestSchema, QuoteCreateResponseSchema
-from app.schemas.polis_schema import TariffEnum, CarTypeEnum
+from app.schemas.polis_schema import (
+    QuoteBatchCreateRequestSchema,
+    QuoteBatchCreateResponseSchema,
+    QuoteCreateRequestSchema,
+    QuoteCreateResponseSchema,
+)
+from app.services.pricing_service import PricingEngine, pricing_rules, quote_price_memo
+from app.services.quote_writer_service import QuoteWriter
+
+# Cached marker for quote IDs that are known not to exist
+QUOTE_NOT_FOUND = ""
+
+
+def _raw(value):
+    """Pass cached quote JSON through aiocache without re-serializing it."""
+    return value
 
 
 class QuoteService:
-    """Service for managing quotes."""
+    """
+    Service for managing quotes.
+
+    With a ``writer``, new quotes are built in-process and handed to the write-behind queue
+    instead of being inserted by the request itself.
+    """
 
-    def __init__(self, quote_repository: QuoteRepository):
+    def __init__(
+        self, quote_repository: QuoteRepository, cache=None, writer: QuoteWriter | None = None
+    ):
         self._repository = quote_repository
+        self._cache = cache
+        self._writer = writer
 
     @staticmethod
-    async def calculate_quote_price(data: QuoteCreateRequestSchema) -> Decimal:
+    def calculate_quote_price(data: QuoteCreateRequestSchema) -> Decimal:
         """Calculate the price of a quote based on the provided data."""
-        price = settings.quote_base_price
+        return pricing_rules.engine.price(data.tariff, data.age, data.experience, data.car_type)
+
+    @staticmethod
+    def calculate_quote_prices(
+        items: list[QuoteCreateRequestSchema], engine: PricingEngine | None = None
+    ) -> list[Decimal]:
+        """Calculate prices for a batch of quotes in a single pass, in input order."""
+        price = (engine or pricing_rules.engine).price
+        return [price(item.tariff, item.age, item.experience, item.car_type) for item in items]
+
+    async def create_quote(self, data: QuoteCreateRequestSchema) -> QuoteCreateResponseSchema:
+        """Create a new quote."""
+        logger.info("Creating quote for: {}", data)
+        # Price and rule version must come from the same engine, even mid-reload
+        engine = pricing_rules.engine
+        with timed("pricing"):
+            quote_price = quote_price_memo.price(
+                engine, data.tariff, data.age, data.experience, data.car_type
+            )
+
+        if self._writer is not None:
+            response = await self._enqueue_quote(data, quote_price, engine.version)
+        else:
+            quote = await self._repository.create_quote(
+                tariff=data.tariff,
+                age=data.age,
+                experience=data.experience,
+                car_type=data.car_type,
+                price=quote_price,
+                rule_version=engine.version,
+            )
+            response = QuoteCreateResponseSchema.from_row(quote)
+            await self._cache_quote(response)
+
+        logger.success("Quote created with ID: {} and price: {}", response.id, quote_price)
+
+        return response
+
+    async def _cache_quote(self, response: QuoteCreateResponseSchema) -> None:
+        """Quotes are immutable, so write the serialized quote through to the cache."""
+        with timed("serialization"):
+            payload = response.model_dump_json()
+        await self._cache_set(
+            [(self._cache_key(response.id), payload)], ttl=settings.quote_cache_ttl
+        )
 
-        # Coefficients
-        TARIFF_COEFF = {
-            TariffEnum.standard: Decimal("1.0"),
-            TariffEnum.premium: Decimal("1.5"),
+    async def _enqueue_quote(
+        self, data: QuoteCreateRequestSchema, price: Decimal, rule_version: str
+    ) -> QuoteCreateResponseSchema:
+        """Build the quote row here, id and timestamp included, and queue it for writing."""
+        row = {
+            "id": uuid.uuid4(),
+            "tariff": data.tariff,
+            "age": data.age,
+            "experience": data.experience,
+            "car_type": data.car_type,
+            "price": price,
+            "rule_version": rule_version,
+            "created_at": datetime.now(timezone.utc),
         }
+        response = QuoteCreateResponseSchema(**row, updated_at=None)
+
+        if self._writer.durability == "enqueue":
+            # Cached before it commits, so a failed batch has to take it out again. Caching
+            # before queueing guarantees that removal comes after the write.
+            await self._cache_quote(response)
+            on_failed = partial(self._cache_delete, self._cache_key(response.id))
+            await self._writer.submit(row, on_failed=on_failed)
+        else:
+            await self._writer.submit(row)
+            await self._cache_quote(response)
+
+        return response
+
+    async def create_quotes(
+        self, data: QuoteBatchCreateRequestSchema
+    ) -> QuoteBatchCreateResponseSchema:
+        """Create a batch of quotes, preserving the input order."""
+        logger.info("Creating batch of {} quotes", len(data.items))
+        engine = pricing_rules.engine
+        with timed("pricing"):
+            prices = self.calculate_quote_prices(data.items, engine)
+
+        quotes = await self._repository.create_quotes(
+            [
+                {
+                    "tariff": item.tariff,
+                    "age": item.age,
+                    "experience": item.experience,
+                    "car_type": item.car_type,
+                    "price": price,
+                    "rule_version": engine.version,
+                }
+                for item, price in zip(data.items, prices)
+            ]
+        )
 
-        def age_coeff(age: int) -> Decimal:
-            if age < 25:
-                return Decimal("1.2")
+        logger.success("Created batch of {} quotes", len(quotes))
 
-            elif age > 60:
-                return Decimal("1.1")
+        with timed("serialization"):
+            response = QuoteBatchCreateResponseSchema.model_validate(
+                {"items": quotes}, from_attributes=True
+            )
+            entries = [
+                (self._cache_key(item.id), item.model_dump_json()) for item in response.items
+            ]
 
-            return Decimal("1.0")
+        await self._cache_set(entries, ttl=settings.quote_cache_ttl)
 
-        def experience_coeff(exp: int) -> Decimal:
-            if exp < 2:
-                return Decimal("1.3")
+        return response
 
-            elif exp < 5:
-                return Decimal("1.1")
+    async def get_quote_json(self, quote_id: UUID) -> str | None:
+        """
+        Retrieve a quote as serialized JSON. Returns None if not found.
 
-            return Decimal("1.0")
+        Reads go to the cache first and skip the ORM and pydantic entirely on a hit.
+        Misses are filled from the database, and unknown IDs are cached briefly as well.
+        """
+        logger.info("Fetching quote with ID: {}", quote_id)
+        key = self._cache_key(quote_id)
 
-        CAR_COEFF = {
-            CarTypeEnum.sedan: Decimal("1.0"),
-            CarTypeEnum.suv: Decimal("1.2"),
-            CarTypeEnum.truck: Decimal("1.3"),
-        }
+        cached = await self._cache_get(key)
+        if cached == QUOTE_NOT_FOUND:
+            logger.warning("Quote with ID {} not found (cached)", quote_id)
+            return None
 
-        logger.info(f"Calculating quote price for: {data.dict()}")
+        if cached is not None:
+            logger.success("Quote fetched from cache with ID: {}", quote_id)
+            return cached
 
-        # Calculation
-        price *= TARIFF_COEFF[data.tariff]
-        price *= age_coeff(data.age)
-        price *= experience_coeff(data.experience)
-        price *= CAR_COEFF[data.car_type]
+        if self._writer is not None:
+            # Do not cache a miss for a quote that is only waiting in this worker's queue
+            await self._writer.wait_for(quote_id)
 
-        # Rounding to 2 decimal places
-        final_price = price.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        logger.info(f"Calculated price: {final_price}")
+        quote = await self._repository.get_quote_by_id(quote_id)
 
-        return final_price
+        if not quote:
+            logger.warning("Quote with ID {} not found", quote_id)
+            await self._cache_set([(key, QUOTE_NOT_FOUND)], ttl=settings.quote_cache_negative_ttl)
+            return None
 
-    async def create_quote(self, data: QuoteCreateRequestSchema) -> QuoteCreateResponseSchema:
-        """Create a new quote."""
-        logger.info(f"Creating quote for: {data.dict()}")
-        quote_price = await self.calculate_quote_price(data)
-
-        quote = await self._repository.create_quote(
-            tariff=data.tariff,
-            age=data.age,
-            experience=data.experience,
-            car_type=data.car_type,
-            price=quote_price,
-        )
+        logger.success("Quote fetched with ID: {}", quote.id)
+        with timed("serialization"):
+            payload = QuoteCreateResponseSchema.from_row(quote).model_dump_json()
 
-        logger.success(f"Quote created with ID: {quote.id} and price: {quote_price}")
-
-        return QuoteCreateResponseSchema(
-            id=quote.id,
-            tariff=quote.tariff,
-            age=quote.age,
-            experience=quote.experience,
-            car_type=quote.car_type,
-            price=quote.price,
-            created_at=quote.created_at,
-            updated_at=quote.updated_at,
-        )
+        await self._cache_set([(key, payload)], ttl=settings.quote_cache_ttl)
 
-    async def get_quote_by_id(self, quote_id: UUID) -> QuoteCreateResponseSchema | None:
-        """Retrieve a quote by ID. Returns None if not found."""
-        logger.info(f"Fetching quote with ID: {quote_id}")
-        quote = await self._repository.get_quote_by_id(quote_id)
+        return payload
 
-        if not quote:
-            logger.warning(f"Quote with ID {quote_id} not found")
+    # --- cache helpers ---
+    @staticmethod
+    def _cache_key(quote_id: UUID) -> str:
+        return f"quote:{quote_id}"
+
+    async def _cache_get(self, key: str) -> str | None:
+        if self._cache is None:
             return None
 
-        logger.success(f"Quote fetched with ID: {quote.id}")
-        return QuoteCreateResponseSchema(
-            id=quote.id,
-            tariff=quote.tariff,
-            age=quote.age,
-            experience=quote.experience,
-            car_type=quote.car_type,
-            price=quote.price,
-            created_at=quote.created_at,
-            updated_at=quote.updated_at,
-        )
+        try:
+            return await self._cache.get(key, loads_fn=_raw)
+        except Exception as e:
+            logger.warning("Quote cache read failed: {}", e)
+            return None
+
+    async def _cache_set(self, pairs: list[tuple[str, str]], ttl: int) -> None:
+        if self._cache is None:
+            return
+
+        try:
+            if len(pairs) == 1:
+                key, value = pairs[0]
+                await self._cache.set(key, value, ttl=ttl, dumps_fn=_raw)
+            else:
+                await self._cache.multi_set(pairs, ttl=ttl, dumps_fn=_raw)
+        except Exception as e:
+            logger.warning("Quote cache write failed: {}", e)
+
+    async def _cache_delete(self, key: str) -> None:
+        if self._cache is None:
+            return
+
+        try:
+            await self._cache.delete(key)
+        except Exception as e:
+            logger.warning("Quote cache delete failed: {}", e)
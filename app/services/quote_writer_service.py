@@ -0,0 +1,186 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Literal
+from uuid import UUID
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.metrics import register_stats
+from app.db.session import SessionLocal
+from app.repositories.quote_repository import QuoteRepository
+
+
+class QuoteWriteError(Exception):
+    """Raised to a waiting request when the batch holding its quote failed to commit."""
+
+
+class QuoteWriter:
+    """
+    Write-behind queue for new quotes.
+
+    Requests hand over fully built rows (client-side id, price and ``created_at``), and a
+    background task inserts them in batches: as soon as ``batch_size`` rows are queued, or
+    ``max_delay`` seconds after the first row of a batch arrived.
+
+    With ``durability="commit"`` a request still waits for the batch holding its quote to
+    commit, but shares that transaction with every other quote in the batch (group commit).
+    With ``durability="enqueue"`` it returns right away, and quotes queued in a worker that
+    dies are lost; a row's ``on_failed`` callback runs if its batch fails to commit. ``close()``
+    drains the queue either way.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        batch_size: int,
+        max_delay: float,
+        max_queue: int,
+        durability: Literal["commit", "enqueue"] = "commit",
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+        self.durability = durability
+        self.queued = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.flush_ms_max = 0.0
+        self._rows: list[dict] = []
+        self._pending: dict[UUID, asyncio.Future] = {}
+        self._on_failed: dict[UUID, Callable[[], Awaitable[None]]] = {}
+        self._arrived = asyncio.Event()
+        self._full = asyncio.Event()
+        self._flushing = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    async def submit(
+        self, row: dict, on_failed: Callable[[], Awaitable[None]] | None = None
+    ) -> None:
+        """
+        Queue one quote row.
+
+        ``on_failed`` is awaited if the row's batch fails to commit, e.g. to undo what the
+        request did on the assumption that it would.
+
+        Raises:
+            QuoteWriteError: With ``durability="commit"``, if the row's batch failed.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+        # Back-pressure: a full queue is flushed by the request that finds it full
+        if len(self._rows) >= self.max_queue:
+            await self.flush()
+
+        future = asyncio.get_running_loop().create_future()
+        self._rows.append(row)
+        self._pending[row["id"]] = future
+        if on_failed is not None:
+            self._on_failed[row["id"]] = on_failed
+        self.queued += 1
+
+        self._arrived.set()
+        if len(self._rows) >= self.batch_size:
+            self._full.set()
+
+        if self.durability == "commit" and not await asyncio.shield(future):
+            raise QuoteWriteError("Quote could not be saved")
+
+    async def wait_for(self, quote_id: UUID) -> None:
+        """Wait until a quote queued in this worker has been written, if it is queued."""
+        future = self._pending.get(quote_id)
+        if future is not None:
+            await asyncio.shield(future)
+
+    async def _run(self) -> None:
+        while True:
+            await self._arrived.wait()
+            if len(self._rows) < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write everything queued so far, ``batch_size`` rows per transaction."""
+        async with self._flushing:
+            while self._rows:
+                rows = self._rows[: self.batch_size]
+                del self._rows[: self.batch_size]
+                if not self._rows:
+                    self._arrived.clear()
+                if len(self._rows) < self.batch_size:
+                    self._full.clear()
+
+                await self._write(rows)
+
+    async def _write(self, rows: list[dict]) -> None:
+        started = time.perf_counter()
+        try:
+            async with self.session_factory() as session:
+                await QuoteRepository(session).insert_quotes(rows)
+        except Exception as e:
+            ok = False
+            self.failed += len(rows)
+            logger.error(
+                "Failed to write {} queued quotes ({}), first id {}", len(rows), e, rows[0]["id"]
+            )
+        else:
+            ok = True
+            self.written += len(rows)
+
+        self.batches += 1
+        self.flush_ms_max = max(self.flush_ms_max, (time.perf_counter() - started) * 1000)
+
+        for row in rows:
+            future = self._pending.pop(row["id"], None)
+            if future is not None and not future.done():
+                future.set_result(ok)
+
+        for row in rows:
+            on_failed = self._on_failed.pop(row["id"], None)
+            if on_failed is None or ok:
+                continue
+            try:
+                await on_failed()
+            except Exception as e:
+                logger.error("Failed to clean up after quote {}: {}", row["id"], e)
+
+    async def close(self) -> None:
+        """Stop the background task and write whatever is still queued."""
+        if self._task is not None:
+            # Never cancel the task in the middle of a batch it already took off the queue
+            async with self._flushing:
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+            self._task = None
+
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.queued,
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches,
+            "pending": len(self._rows),
+            "flush_ms_max": round(self.flush_ms_max, 2),
+        }
+
+
+quote_writer = QuoteWriter(
+    session_factory=SessionLocal,
+    batch_size=settings.quote_write_behind_batch_size,
+    max_delay=settings.quote_write_behind_max_delay_ms / 1000,
+    max_queue=settings.quote_write_behind_max_queue,
+    durability=settings.quote_write_behind_durability,
+)
+register_stats("quote_writer", quote_writer.stats)
@@ -0,0 +1,177 @@
+import math
+import secrets
+import time
+from collections import deque
+from typing import Literal, NamedTuple
+
+from loguru import logger
+
+from app.core.lru import LRUCache
+from app.core.metrics import record_time
+
+# Sliding window log: one sorted-set member per admitted request, scored by its time in ms.
+# Returns {allowed, remaining, ms until the oldest request leaves the window}.
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local member = ARGV[3]
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+local count = redis.call('ZCARD', key)
+local allowed = 0
+if count < limit then
+    redis.call('ZADD', key, now, member)
+    count = count + 1
+    allowed = 1
+end
+redis.call('PEXPIRE', key, window)
+
+local reset = window
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+if oldest[2] then
+    reset = tonumber(oldest[2]) + window - now
+end
+
+return {allowed, limit - count, reset}
+"""
+
+# Token bucket: `limit` tokens refilled evenly over `window` ms, stored as a hash.
+# Returns {allowed, remaining whole tokens, ms until the next token (or full bucket)}.
+TOKEN_BUCKET_SCRIPT = """
+local key = KEYS[1]
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local rate = limit / window
+
+local state = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+    tokens = limit
+    ts = now
+end
+
+tokens = math.min(limit, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local reset
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+    reset = math.ceil((limit - tokens) / rate)
+else
+    reset = math.ceil((1 - tokens) / rate)
+end
+
+redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', key, window)
+
+return {allowed, math.floor(tokens), reset}
+"""
+
+SCRIPTS = {
+    "sliding_window": SLIDING_WINDOW_SCRIPT,
+    "token_bucket": TOKEN_BUCKET_SCRIPT,
+}
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: float  # seconds until the quota frees up
+
+    def headers(self) -> dict[str, str]:
+        """Return the ``X-RateLimit-*`` headers (and ``Retry-After`` when rejected)."""
+        reset = str(math.ceil(self.reset))
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(max(self.remaining, 0)),
+            "X-RateLimit-Reset": reset,
+        }
+
+        if not self.allowed:
+            headers["Retry-After"] = reset
+
+        return headers
+
+
+class RateLimiter:
+    """
+    Atomic rate limiter.
+
+    With a Redis-backed cache, the check and the update run as one server-side script, so
+    every hit is a single round trip and concurrent requests cannot race each other. Caches
+    without a Redis client (e.g. an in-memory cache) fall back to per-process state.
+    """
+
+    def __init__(
+        self,
+        cache,
+        algorithm: Literal["sliding_window", "token_bucket"] = "sliding_window",
+        local_max_keys: int = 10_000,
+    ):
+        self.algorithm = algorithm
+
+        client = getattr(cache, "client", None)
+        self._script = client.register_script(SCRIPTS[algorithm]) if client else None
+        self._local = LRUCache(maxsize=local_max_keys)
+
+        if self._script is None:
+            logger.warning("Cache has no Redis client, rate limits are tracked per process")
+
+    async def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        """Count one request against ``key`` allowing ``limit`` requests per ``window`` seconds."""
+        window_ms = window * 1000
+
+        if self._script is None:
+            allowed, remaining, reset_ms = self._local_hit(key, limit, window_ms)
+        else:
+            args = [limit, window_ms]
+            if self.algorithm == "sliding_window":
+                args.append(secrets.token_hex(8))
+
+            started = time.perf_counter()
+            allowed, remaining, reset_ms = await self._script(keys=[key], args=args)
+            record_time("redis", time.perf_counter() - started)
+
+        return RateLimitResult(
+            allowed=bool(allowed), limit=limit, remaining=int(remaining), reset=reset_ms / 1000
+        )
+
+    def _local_hit(self, key: str, limit: int, window_ms: int) -> tuple[int, int, float]:
+        now = time.monotonic() * 1000
+
+        if self.algorithm == "sliding_window":
+            log = self._local.get(key)
+            if log is None:
+                log = deque()
+                self._local.set(key, log)
+
+            while log and log[0] <= now - window_ms:
+                log.popleft()
+
+            allowed = len(log) < limit
+            if allowed:
+                log.append(now)
+
+            reset = log[0] + window_ms - now if log else window_ms
+            return int(allowed), limit - len(log), reset
+
+        rate = limit / window_ms
+        tokens, ts = self._local.get(key, (limit, now))
+        tokens = min(limit, tokens + max(0.0, now - ts) * rate)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+            reset = math.ceil((limit - tokens) / rate)
+        else:
+            reset = math.ceil((1 - tokens) / rate)
+
+        self._local.set(key, (tokens, now))
+        return int(allowed), math.floor(tokens), reset
@@ -0,0 +1,72 @@
+import time
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.lru import LRUCache
+from app.core.metrics import register_stats
+
+
+def writer_identity(username: str | None, address: str | None) -> str:
+    """
+    Whom a recent write mark belongs to: the user when known, so clients sharing an address
+    behind NAT or a proxy do not pin each other to the primary, otherwise the address.
+    """
+    return f"user:{username}" if username else f"ip:{address or 'unknown'}"
+
+
+class RecentWriters:
+    """
+    Remembers which clients wrote recently, so their reads go to the primary until the
+    replica has had time to catch up. Clients are ``writer_identity`` strings.
+
+    Marks are kept in this worker and in Redis, so a read served by another worker still
+    sees them. If Redis fails, only the local marks are used.
+    """
+
+    def __init__(self, window: float, maxsize: int = 10_000):
+        self.window = window
+        self.primary_reads = 0
+        self.replica_reads = 0
+        self._local = LRUCache(maxsize=maxsize)
+
+    @staticmethod
+    def _key(client: str) -> str:
+        return f"recent_write:{client}"
+
+    async def mark(self, cache, client: str) -> None:
+        """Record that ``client`` just wrote."""
+        self._local.set(client, True, expires_at=time.time() + self.window)
+
+        try:
+            await cache.set(self._key(client), "1", ttl=float(self.window))
+        except Exception as e:
+            logger.warning("Failed to share recent write mark: {}", e)
+
+    async def wrote_recently(self, cache, client: str) -> bool:
+        """Whether ``client`` wrote within the window, and its reads belong on the primary."""
+        wrote = self._local.get(client, False)
+
+        if not wrote:
+            try:
+                wrote = bool(await cache.exists(self._key(client)))
+            except Exception as e:
+                logger.warning("Failed to check recent write mark: {}", e)
+
+        if wrote:
+            self.primary_reads += 1
+        else:
+            self.replica_reads += 1
+
+        return wrote
+
+    def stats(self) -> dict:
+        return {
+            "primary_reads": self.primary_reads,
+            "replica_reads": self.replica_reads,
+            "local_marks": len(self._local),
+        }
+
+
+recent_writers = RecentWriters(window=settings.db_read_your_writes_ms / 1000)
+register_stats("read_routing", recent_writers.stats)
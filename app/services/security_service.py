@@ -1,12 +1,69 @@
+import hashlib
+import time
 from datetime import timedelta, datetime
+from functools import cached_property
 
-from jose import jwt, JWTError
 from loguru import logger
-from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.lru import LRUCache
+from app.core.metrics import register_stats
+from app.services.password_hasher_service import password_hasher
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+class TokenVerifier:
+    """
+    Verifies JWTs against a signing key that is built once, and remembers verified tokens.
+
+    Claims of a verified token are cached by the token's digest until its ``exp``, so a
+    token seen before skips parsing and the signature check entirely. Tokens that fail
+    verification, or carry no ``exp``, are never cached. The same key signs new tokens.
+    """
+
+    def __init__(self, secret_key: str, algorithm: str, maxsize: int):
+        self.algorithm = algorithm
+        self._secret_key = secret_key
+        self._claims = LRUCache(maxsize=maxsize)
+
+    @cached_property
+    def key(self):
+        """The prepared jose key; jose pulls in cryptography, so it is imported here."""
+        from jose import jwk
+
+        return jwk.construct(self._secret_key, self.algorithm)
+
+    def decode(self, token: str) -> dict | None:
+        """Return the claims of a valid token, or None."""
+        digest = hashlib.sha256(token.encode()).digest()
+        claims = self._claims.get(digest)
+        if claims is not None:
+            return dict(claims)
+
+        from jose import jwt, JWTError
+
+        try:
+            claims = jwt.decode(token, self.key, algorithms=[self.algorithm])
+        except JWTError as e:
+            logger.error(e)
+            return None
+
+        expires_at = claims.get("exp")
+        if isinstance(expires_at, (int, float)) and expires_at > time.time():
+            self._claims.set(digest, dict(claims), expires_at=expires_at)
+
+        return claims
+
+    def stats(self) -> dict:
+        """Return size and hit/miss counters."""
+        return self._claims.stats()
+
+
+token_verifier = TokenVerifier(
+    secret_key=settings.secret_key,
+    algorithm=settings.algorithm,
+    maxsize=settings.token_cache_size,
+)
+register_stats("token_cache", token_verifier.stats)
 
 
 class SecurityService:
@@ -14,7 +71,7 @@ class SecurityService:
 
     def _create_access_token(self, data: dict, expires_delta: timedelta | None = None) -> str:
         """Create an access token with a short expiration time."""
-        logger.info(f"Creating access token for {data}")
+        logger.info("Creating access token for {}", data.get("sub"))
 
         if expires_delta is None:
             logger.debug("Setting default access token expiration")
@@ -24,7 +81,7 @@ class SecurityService:
 
     def _create_refresh_token(self, data: dict, expires_delta: timedelta | None = None) -> str:
         """Create a refresh token with a longer expiration time."""
-        logger.info(f"create refresh token with data: {data}")
+        logger.info("Creating refresh token for {}", data.get("sub"))
 
         if expires_delta is None:
             logger.debug("Setting default refresh token expiration")
@@ -33,48 +90,46 @@ class SecurityService:
         return self.__create_token(data, expires_delta)
 
     @staticmethod
-    def _verify_password(plain_password: str, hashed_password: str) -> bool:
-        """Verify a plain password against a hashed password."""
+    async def _verify_password(plain_password: str, hashed_password: str) -> bool:
+        """Verify a plain password against a hashed password on the hashing pool."""
         logger.info("Verifying password")
-        return pwd_context.verify(plain_password, hashed_password)
+        return await password_hasher.verify(plain_password, hashed_password)
 
     @staticmethod
-    def verify_token(token: str) -> str | None:
-        """Verify a token and return the username if valid."""
-        logger.info(f"Verifying token: {token}")
+    def decode_token(token: str) -> dict | None:
+        """Decode and verify a token and return its claims if valid."""
+        logger.info("Decoding token")
+        return token_verifier.decode(token)
 
-        try:
-            payload = jwt.decode(
-                token,
-                settings.secret_key,
-                algorithms=[settings.algorithm],
-            )
-            username: str = payload.get("sub")
-            if username is None:
-                logger.warning("Username not found in token payload")
-                return None
-
-            logger.info(f"Username found in token payload: {username}")
-            return username
+    @classmethod
+    def verify_token(cls, token: str) -> str | None:
+        """Verify a token and return the username if valid."""
+        payload = cls.decode_token(token)
+        if payload is None:
+            return None
 
-        except JWTError as e:
-            logger.error(e)
+        username: str = payload.get("sub")
+        if username is None:
+            logger.warning("Username not found in token payload")
             return None
 
+        logger.info("Username found in token payload: {}", username)
+        return username
+
     @staticmethod
-    def _get_password_hash(password: str) -> str:
-        """Hash a plain password."""
+    async def _get_password_hash(password: str) -> str:
+        """Hash a plain password on the hashing pool."""
         logger.info("Hashing password")
-        return pwd_context.hash(password)
+        return await password_hasher.hash(password)
 
     @staticmethod
     def __create_token(data: dict, expires_delta: timedelta | None = None) -> str:
         """Create a JWT token with an expiration time."""
-        logger.info(f"Creating JWT token: {data}")
+        logger.debug("Creating JWT token for {}", data.get("sub"))
         to_encode = data.copy()
 
         if expires_delta:
-            logger.debug(f"Expiring token: {expires_delta}")
+            logger.debug("Expiring token: {}", expires_delta)
             expire = datetime.now() + expires_delta
         else:
             logger.debug("No expiration time")
@@ -82,9 +137,10 @@ class SecurityService:
 
         to_encode.update({"exp": expire})
 
-        logger.debug(f"to_encode: {to_encode}")
+        from jose import jwt
+
         return jwt.encode(
             claims=to_encode,
-            key=settings.secret_key,
+            key=token_verifier.key,
             algorithm=settings.algorithm,
         )
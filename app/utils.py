@@ -1,4 +1,6 @@
+import asyncio
 import sys
+import time
 from functools import wraps
 
 from fastapi import FastAPI
@@ -7,8 +9,16 @@ from starlette import status
 from starlette.responses import JSONResponse
 
 from app.core.config import settings
+from app.core.logging_setup import configure_logging, shutdown_logging
+from app.core.metrics import startup_timings
+from app.db.revision import check_revision
 from app.db.session import engine, Base
 from app.factories import cache_factory
+from app.services.password_hasher_service import password_hasher
+from app.services.pricing_service import pricing_rules
+from app.services.quote_writer_service import quote_writer
+from app.services.rate_limit_service import RateLimiter
+from app.services.security_service import token_verifier
 
 
 def rate_limit(
@@ -28,24 +38,20 @@ def rate_limit(
 
             client_ip = request.client.host
             route_name = request.url.path
-            cache = request.app.state.cache
+            rate_limiter = request.app.state.rate_limiter
 
             # Key for storing request count
             key = f"rate_limit:{client_ip}:{route_name}"
 
-            request_count = await cache.get(key)
+            result = await rate_limiter.hit(key, limit=max_requests, window=time_window)
 
-            if request_count is None:
-                await cache.set(key, 1, ttl=time_window)
-
-            elif int(request_count) >= max_requests:
+            if not result.allowed:
                 # Too many requests
                 return JSONResponse(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                     content={"detail": "Too many requests. Try again later."},
+                    headers=result.headers(),
                 )
-            else:
-                await cache.increment(key)
 
             return await func(*args, **kwargs)
 
@@ -56,13 +62,10 @@ def rate_limit(
 
 async def startup_application(app_local: FastAPI) -> None:
     """Initialize the Redis cache and database engine/session maker."""
+    started = time.perf_counter()
 
     # Configure loguru logger
-    LOG_LEVEL = "DEBUG" if settings.app_debug else "INFO"
-    logger.add(sys.stdout, level=LOG_LEVEL)
-    logger.add(
-        "logs/app.log", level=LOG_LEVEL, rotation="10 MB", retention="7 days", compression="zip"
-    )
+    configure_logging()
 
     # Initialize Redis cache
     if not hasattr(app_local.state, "cache"):
@@ -73,19 +76,70 @@ async def startup_application(app_local: FastAPI) -> None:
 
     logger.info("✅ Redis cache initialized.")
 
-    # Initialize database engine and create tables
+    # Initialize rate limiter on top of the cache
+    if not hasattr(app_local.state, "rate_limiter"):
+        app_local.state.rate_limiter = RateLimiter(
+            app_local.state.cache, algorithm=settings.rate_limit_algorithm
+        )
+
+    logger.info("✅ Rate limiter initialized ({}).", settings.rate_limit_algorithm)
+
+    # Initialize database engine and check the schema
     if not hasattr(app_local.state, "db_engine"):
         logger.info("🔧 Setting up database engine...")
         app_local.state.db_engine = engine
 
-    async with app_local.state.db_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
-    logger.info("✅ Database initialized and tables created.")
+    if settings.db_startup_mode == "check_revision":
+        revision = await check_revision(app_local.state.db_engine)
+        logger.info("✅ Database is at revision {}.", revision)
+    elif settings.db_startup_mode == "create_all":
+        async with app_local.state.db_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        logger.info("✅ Database initialized and tables created.")
+
+    # Load the pricing rules, then watch the file for changes
+    pricing_rules.load()
+    if settings.pricing_rules_reload_interval > 0 and not hasattr(
+        app_local.state, "pricing_rules_watcher"
+    ):
+        app_local.state.pricing_rules_watcher = asyncio.create_task(
+            pricing_rules.watch(settings.pricing_rules_reload_interval)
+        )
+
+    logger.info("✅ Pricing rules {} loaded.", pricing_rules.engine.version)
+
+    # Build the JWT key now rather than on the first authenticated request
+    logger.info("✅ Token key prepared ({}).", type(token_verifier.key).__name__)
+
+    startup_timings["startup_ms"] = (time.perf_counter() - started) * 1000
+    logger.info(
+        "🚀 Ready: imports took {:.0f} ms, startup {:.0f} ms.",
+        startup_timings["import_ms"],
+        startup_timings["startup_ms"],
+    )
 
 
 async def shutdown_application(app_local: FastAPI) -> None:
-    """Dispose of the database engine and session maker."""
+    """Close the Redis cache, the database pool and background workers."""
+
+    # Write queued quotes while the database pool is still open
+    await quote_writer.close()
+    logger.info("🧹 Quote write-behind queue drained.")
 
     await app_local.state.cache.close()
     logger.info("🧹 Redis cache closed.")
+
+    await app_local.state.db_engine.dispose()
+    logger.info("🧹 Database connections closed.")
+
+    password_hasher.shutdown()
+    logger.info("🧹 Password hashing pool stopped.")
+
+    watcher = getattr(app_local.state, "pricing_rules_watcher", None)
+    if watcher is not None:
+        watcher.cancel()
+        logger.info("🧹 Pricing rules watcher stopped.")
+
+    # Flush queued log lines; later messages go to stderr if no sink is left
+    if shutdown_logging():
+        logger.add(sys.stderr, level="INFO")
@@ -0,0 +1,162 @@
+"""
+Statement count and latency of application reads.
+
+Checks that ``ApplicationRepository.get_application`` and ``list_applications`` each run a
+single SQL statement that loads the quote and the owner without the owner's password hash,
+and that the results serialize without triggering a lazy load, then times both.
+
+Runs against in-memory SQLite by default, or any empty, disposable database:
+
+    python -m benchmarks.application_query_benchmark
+    python -m benchmarks.application_query_benchmark --database-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+for name, value in {
+    "SECRET_KEY": "benchmark",
+    "DB_USER": "benchmark",
+    "DB_PASSWORD": "benchmark",
+    "DB_NAME": "benchmark",
+}.items():
+    os.environ.setdefault(name, value)
+
+from loguru import logger  # noqa: E402
+
+logger.remove()
+logger.add(sys.stderr, level="WARNING")
+
+from sqlalchemy import event, insert  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from app.db.models.application_model import Application  # noqa: E402
+from app.db.models.quote_model import Quote  # noqa: E402
+from app.db.models.user_model import User  # noqa: E402
+from app.db.session import Base  # noqa: E402
+from app.repositories.application_repository import ApplicationRepository  # noqa: E402
+from app.schemas.auth_schema import UserResponseSchema  # noqa: E402
+from app.services.application_service import ApplicationService  # noqa: E402
+
+APPLICATIONS = 500
+
+
+@contextmanager
+def count_statements(engine):
+    """Collect every statement the engine sends while the block runs."""
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+async def seed(session: AsyncSession) -> tuple[UserResponseSchema, list]:
+    owner = UserResponseSchema(id=uuid4(), full_name="Benchmark User", username="benchmark")
+    await session.execute(
+        insert(User).values(
+            id=owner.id, full_name=owner.full_name, username=owner.username, password="x" * 60
+        )
+    )
+
+    quote_id = uuid4()
+    await session.execute(
+        insert(Quote).values(
+            id=quote_id,
+            tariff="premium",
+            age=30,
+            experience=3,
+            car_type="suv",
+            price=Decimal("1980"),
+        )
+    )
+
+    started = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        {
+            "id": uuid4(),
+            "full_name": f"Applicant {i}",
+            "phone": "+998901234567",
+            "email": f"applicant{i}@example.com",
+            "tariff": "premium",
+            "quote_id": quote_id,
+            "owner_id": owner.id,
+            "status": "new",
+            "created_at": started + timedelta(seconds=i),
+        }
+        for i in range(APPLICATIONS)
+    ]
+    await session.execute(insert(Application), rows)
+    await session.commit()
+
+    return owner, [row["id"] for row in rows]
+
+
+def check(statements: list[str], label: str) -> None:
+    if len(statements) != 1:
+        raise AssertionError(f"{label}: expected 1 statement, got {len(statements)}")
+    if "users.password" in statements[0]:
+        raise AssertionError(f"{label}: the owner's password hash was loaded")
+
+
+async def timed(label: str, number: int, call) -> None:
+    started = time.perf_counter()
+    for _ in range(number):
+        await call()
+    elapsed = time.perf_counter() - started
+    print(f"{label:18} {elapsed / number * 1e3:8.3f} ms/call")
+
+
+async def run(args) -> None:
+    engine = create_async_engine(args.database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        owner, application_ids = await seed(session)
+        service = ApplicationService(ApplicationRepository(session))
+
+        async def get():
+            session.expunge_all()
+            return await service.get_application(application_ids[-1], owner=owner)
+
+        async def list_page():
+            session.expunge_all()
+            return await service.list_applications(owner=owner, limit=args.page_size)
+
+        for label, call in (("get_application", get), ("list_applications", list_page)):
+            with count_statements(engine) as statements:
+                response = await call()
+            check(statements, label)
+            print(f"{label:18} 1 statement, {len(response.model_dump_json())} bytes")
+
+        await timed("get_application", args.number, get)
+        await timed("list_applications", args.number, list_page)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite://")
+    parser.add_argument("--number", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=20)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
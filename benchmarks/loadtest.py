@@ -0,0 +1,425 @@
+"""
+Load test for every route in ``app/endpoints/v1``, driving ``app.main.app`` in-process.
+
+The app runs against a throwaway database and an in-memory cache standing in for Redis:
+
+* ``--database-url postgresql+asyncpg://...`` uses that (empty, disposable) database.
+  Tables are created before the run and dropped after it.
+* Without it, a temporary SQLite file is used. SQLite cannot run the data-modifying CTE
+  behind ``POST /applications``, so the application scenarios are skipped there.
+
+Each scenario reports throughput and p50/p95/p99 latency as JSON. With ``--baseline`` the
+run is compared against a stored report and exits non-zero if any scenario's throughput
+drops, or its p95 grows, by more than ``--threshold``, or if it starts failing requests.
+
+    python -m benchmarks.loadtest --requests 500 --concurrency 50 --output report.json
+    python -m benchmarks.loadtest --baseline benchmarks/loadtest_baseline.json
+    python -m benchmarks.loadtest --baseline benchmarks/loadtest_baseline.json --update-baseline
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from itertools import count
+from typing import Awaitable, Callable
+
+for name, value in {
+    "SECRET_KEY": "loadtest",
+    "DB_USER": "loadtest",
+    "DB_PASSWORD": "loadtest",
+    "DB_NAME": "loadtest",
+    "RATE_LIMIT_REQUESTS": "1000000000",
+}.items():
+    os.environ.setdefault(name, value)
+
+import httpx  # noqa: E402
+from aiocache import SimpleMemoryCache  # noqa: E402
+from loguru import logger  # noqa: E402
+
+logger.remove()
+logger.add(sys.stderr, level="WARNING")
+
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+from app.db.models import application_model, quote_model, user_model  # noqa: E402, F401
+from app.db.session import Base, SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.rate_limit_service import RateLimiter  # noqa: E402
+
+API = "/api/v1"
+PASSWORD = "loadtest-password"
+QUOTE_BODY = {"tariff": "premium", "age": 30, "experience": 3, "car_type": "suv"}
+BATCH_SIZE = 100
+
+RequestFactory = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+class VirtualUsers:
+    """
+    One client per concurrent virtual user.
+
+    Every request gets a fresh client address, so the per-IP rate limits are exercised on
+    each call but never trip.
+    """
+
+    def __init__(self, concurrency: int):
+        self._addresses = count()
+        self._transports = [
+            httpx.ASGITransport(app=app, client=("10.0.0.0", 0)) for _ in range(concurrency)
+        ]
+        self.clients = [
+            httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60)
+            for transport in self._transports
+        ]
+
+    def next_address(self, user: int) -> None:
+        n = next(self._addresses)
+        self._transports[user].client = (f"10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}", 0)
+
+    async def close(self) -> None:
+        for client in self.clients:
+            await client.aclose()
+
+
+def _percentile(latencies: list[float], q: float) -> float:
+    return latencies[min(len(latencies) - 1, int(len(latencies) * q))]
+
+
+async def run_scenario(
+    users: VirtualUsers,
+    requests: int,
+    make_request: RequestFactory,
+    ok: set[int],
+    stop: asyncio.Event | None = None,
+) -> tuple[dict, list[httpx.Response]]:
+    """
+    Send ``requests`` requests from all virtual users and summarize the results.
+
+    With ``stop``, no new request starts once the event is set, so ``requests`` is only an
+    upper bound.
+    """
+    indexes = iter(range(requests))
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    responses: list[httpx.Response | None] = [None] * requests
+
+    async def virtual_user(user: int) -> None:
+        client = users.clients[user]
+        for i in indexes:
+            if stop is not None and stop.is_set():
+                break
+            users.next_address(user)
+            started = time.perf_counter()
+            response = await make_request(client, i)
+            latencies.append(time.perf_counter() - started)
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+            responses[i] = response
+
+    started = time.perf_counter()
+    await asyncio.gather(*[virtual_user(user) for user in range(len(users.clients))])
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    requests = len(latencies)
+    errors = sum(n for code, n in statuses.items() if int(code) not in ok)
+    summary = {
+        "requests": requests,
+        "errors": errors,
+        "status_codes": statuses,
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+    }
+    return summary, [response for response in responses if response is not None]
+
+
+async def run(args) -> dict:
+    if args.database_url:
+        database_url = args.database_url
+    else:
+        database_url = f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='loadtest-')}/loadtest.db"
+
+    engine = create_async_engine(database_url, connect_args=_connect_args(database_url))
+    SessionLocal.configure(bind=engine)
+    supports_applications = engine.dialect.name == "postgresql"
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    # What startup_application would set up, minus Redis and the real database
+    app.state.cache = SimpleMemoryCache()
+    app.state.rate_limiter = RateLimiter(app.state.cache)
+    app.state.db_engine = engine
+
+    users = VirtualUsers(args.concurrency)
+    n = args.requests
+    results: dict[str, dict] = {}
+    tokens: list[dict] = []
+    quote_ids: list[str] = []
+    application_ids: list[tuple[int, str]] = []
+
+    def auth(i: int) -> dict:
+        return {"Authorization": f"Bearer {tokens[i % len(tokens)]['access_token']}"}
+
+    async def scenario(
+        name: str,
+        requests: int,
+        make_request: RequestFactory,
+        ok=(200,),
+        users: VirtualUsers = users,
+        stop: asyncio.Event | None = None,
+    ):
+        summary, responses = await run_scenario(users, requests, make_request, set(ok), stop)
+        results[name] = summary
+        print(f"{name:32} {json.dumps(summary)}", file=sys.stderr)
+        return [(i, r) for i, r in enumerate(responses) if r.status_code in ok]
+
+    # Registration and login are bcrypt-bound, so they run fewer requests
+    auth_requests = max(1, n // 5)
+    registered = await scenario(
+        "auth_register",
+        auth_requests,
+        lambda client, i: client.post(
+            f"{API}/auth/register",
+            json={
+                "username": f"loadtest{i}",
+                "full_name": f"Load Test {i}",
+                "password": PASSWORD,
+                "password_confirm": PASSWORD,
+            },
+        ),
+    )
+    usernames = [f"loadtest{i}" for i, _ in registered]
+    tokens = [r.json() for _, r in registered]
+    if not tokens:
+        raise SystemExit("No users could be registered, cannot continue")
+
+    # A login storm: every virtual user logs in at once
+    await scenario(
+        "auth_login",
+        auth_requests,
+        lambda client, i: client.post(
+            f"{API}/auth/login",
+            json={"username": usernames[i % len(usernames)], "password": PASSWORD},
+        ),
+    )
+    await scenario(
+        "auth_refresh_token",
+        n,
+        lambda client, i: client.post(
+            f"{API}/auth/refresh-token",
+            json={"refresh_token": tokens[i % len(tokens)]["refresh_token"]},
+        ),
+    )
+    await scenario("users_me", n, lambda client, i: client.post(f"{API}/users/me", headers=auth(i)))
+
+    created = await scenario(
+        "quote_create", n, lambda client, i: client.post(f"{API}/quotes", json=QUOTE_BODY)
+    )
+    quote_ids = [r.json()["id"] for _, r in created]
+
+    # The same quote traffic while a second set of virtual users keeps logging in, to show
+    # that bcrypt on the hashing pool leaves the quote routes' latency alone
+    storm_users = VirtualUsers(args.concurrency)
+    quotes_done = asyncio.Event()
+
+    async def quotes_during_storm():
+        try:
+            return await scenario(
+                "quote_create_during_login_storm",
+                n,
+                lambda client, i: client.post(f"{API}/quotes", json=QUOTE_BODY),
+            )
+        finally:
+            quotes_done.set()
+
+    await asyncio.gather(
+        scenario(
+            "auth_login_storm",
+            n,
+            lambda client, i: client.post(
+                f"{API}/auth/login",
+                json={"username": usernames[i % len(usernames)], "password": PASSWORD},
+            ),
+            # Logins the hashing pool turns away are part of a storm, not failures
+            ok=(200, 503),
+            users=storm_users,
+            stop=quotes_done,
+        ),
+        quotes_during_storm(),
+    )
+    await storm_users.close()
+    print(f"{'login_storm':32} {json.dumps(login_storm_impact(results))}", file=sys.stderr)
+
+    # Mobile-style retries: every virtual user reuses a handful of keys, so most requests
+    # are replays of a stored response
+    await scenario(
+        "quote_create_retry",
+        n,
+        lambda client, i: client.post(
+            f"{API}/quotes", json=QUOTE_BODY, headers={"Idempotency-Key": f"loadtest{i % 10}"}
+        ),
+    )
+    await scenario(
+        "quote_create_batch",
+        max(1, n // 10),
+        lambda client, i: client.post(
+            f"{API}/quotes/batch", json={"items": [QUOTE_BODY] * BATCH_SIZE}
+        ),
+    )
+    if quote_ids:
+        await scenario(
+            "quote_get",
+            n,
+            lambda client, i: client.get(f"{API}/quotes/{quote_ids[i % len(quote_ids)]}"),
+        )
+
+    if supports_applications and quote_ids:
+        created = await scenario(
+            "application_create",
+            n,
+            lambda client, i: client.post(
+                f"{API}/applications",
+                headers=auth(i),
+                json={
+                    "full_name": f"Load Test {i}",
+                    "phone": "+998901234567",
+                    "email": f"loadtest{i}@example.com",
+                    "tariff": "premium",
+                    "quote_id": quote_ids[i % len(quote_ids)],
+                },
+            ),
+        )
+        application_ids = [(i, r.json()["id"]) for i, r in created]
+        if application_ids:
+            await scenario(
+                "application_get",
+                n,
+                lambda client, i: client.get(
+                    f"{API}/applications/{application_ids[i % len(application_ids)][1]}",
+                    headers=auth(application_ids[i % len(application_ids)][0]),
+                ),
+            )
+            await scenario(
+                "application_list",
+                n,
+                lambda client, i: client.get(
+                    f"{API}/applications",
+                    headers=auth(application_ids[i % len(application_ids)][0]),
+                ),
+            )
+
+    await users.close()
+
+    if args.database_url:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+    return {
+        "meta": {
+            "database": engine.dialect.name,
+            "requests": n,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+        },
+        "skipped": (
+            []
+            if supports_applications
+            else ["application_create", "application_get", "application_list"]
+        ),
+        "scenarios": results,
+        "login_storm": login_storm_impact(results),
+    }
+
+
+def login_storm_impact(scenarios: dict) -> dict:
+    """Quote create latency on its own and while the login storm runs."""
+    alone = scenarios["quote_create"]
+    during = scenarios["quote_create_during_login_storm"]
+    return {
+        "quote_p95_ms": alone["p95_ms"],
+        "quote_p99_ms": alone["p99_ms"],
+        "quote_p95_ms_during_storm": during["p95_ms"],
+        "quote_p99_ms_during_storm": during["p99_ms"],
+        "p95_ratio": round(during["p95_ms"] / alone["p95_ms"], 2),
+        "logins_during_storm": scenarios["auth_login_storm"]["requests"],
+    }
+
+
+def _connect_args(database_url: str) -> dict:
+    # SQLite serializes writers; wait for the lock instead of failing under concurrency
+    return {"timeout": 30} if database_url.startswith("sqlite") else {}
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a description of every scenario that regressed past the threshold."""
+    regressions = []
+    for name, base in baseline["scenarios"].items():
+        current = report["scenarios"].get(name)
+        if current is None:
+            continue
+
+        if current["throughput_rps"] < base["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {current['throughput_rps']} < {base['throughput_rps']} rps"
+            )
+        if current["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {current['p95_ms']} > {base['p95_ms']} ms")
+        if current["errors"] / current["requests"] > base["errors"] / base["requests"]:
+            regressions.append(f"{name}: {current['errors']} errors (baseline {base['errors']})")
+
+    # Quote latency under the storm, relative to no storm, so a slower machine alone does not
+    # count as the storm hurting more
+    storm, base_storm = report.get("login_storm"), baseline.get("login_storm")
+    if storm and base_storm and storm["p95_ratio"] > base_storm["p95_ratio"] * (1 + threshold):
+        regressions.append(
+            f"login_storm: quote p95 is {storm['p95_ratio']}x its no-storm value "
+            f"(baseline {base_storm['p95_ratio']}x)"
+        )
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default=os.environ.get("LOADTEST_DATABASE_URL"))
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed regression ratio")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+    elif args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = compare(report, json.load(f), args.threshold)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if report.get("regressions"):
+        for regression in report["regressions"]:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
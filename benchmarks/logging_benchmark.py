@@ -0,0 +1,122 @@
+"""
+Requests per second and p99 latency of POST /api/v1/quotes with the previous logging setup
+(eager f-strings, synchronous rotating file sink) vs. the background sink pipeline.
+
+The route body is a stand-in that logs the same lines as the real route and
+``QuoteService.create_quote``, so the numbers isolate logging overhead from the database.
+
+    python -m benchmarks.logging_benchmark --requests 20000 --concurrency 100
+
+``--stdout-latency-ms`` delays every stdout write to model a slow log pipe; set it to 0 to
+measure formatting and queueing cost alone.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+for name, value in {
+    "SECRET_KEY": "benchmark",
+    "DB_USER": "benchmark",
+    "DB_PASSWORD": "benchmark",
+    "DB_NAME": "benchmark",
+    "RATE_LIMIT_REQUESTS": "1000000000",
+}.items():
+    os.environ.setdefault(name, value)
+
+from fastapi import FastAPI  # noqa: E402
+from loguru import logger  # noqa: E402
+
+from app.core import logging_setup  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.endpoints.middlewares import LogSamplingMiddleware  # noqa: E402
+from app.schemas.polis_schema import (  # noqa: E402
+    QuoteCreateRequestSchema,
+    QuoteCreateResponseSchema,
+)
+from benchmarks.middleware_benchmark import measure  # noqa: E402
+
+
+def build_app(eager: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/api/v1/quotes")
+    async def create_quote(data: QuoteCreateRequestSchema) -> QuoteCreateResponseSchema:
+        if eager:
+            logger.info(f"Creating new quote with data: {data.model_dump()}")
+            logger.info(f"Creating quote for: {data.model_dump()}")
+            logger.debug(f"Calculating quote price for data: {data.model_dump()}")
+        else:
+            logger.info("Creating new quote with data: {}", data)
+            logger.info("Creating quote for: {}", data)
+            logger.debug("Calculating quote price for data: {}", data)
+
+        response = QuoteCreateResponseSchema(
+            **data.model_dump(),
+            id=uuid4(),
+            price=Decimal("1000.00"),
+            created_at=datetime.now(timezone.utc),
+            updated_at=None,
+        )
+        logger.success("Quote created with ID: {} and price: {}", response.id, response.price)
+        logger.info("Created quote with ID: {}", response.id)
+        return response
+
+    app.add_middleware(LogSamplingMiddleware)
+    return app
+
+
+async def main(args) -> None:
+    log_dir = tempfile.mkdtemp(prefix="log-benchmark-")
+    settings.log_level = "INFO"
+    settings.log_file = os.path.join(log_dir, "app.log")
+    devnull = open(os.devnull, "w")
+
+    def stdout(text: str) -> None:
+        # Stand-in for a stdout pipe (container log driver) that takes a while to drain
+        if args.stdout_latency_ms:
+            time.sleep(args.stdout_latency_ms / 1000)
+        devnull.write(text)
+
+    logging_setup._stdout_writer = stdout
+
+    for name, eager, background, sample_rates in (
+        ("eager, sync sink", True, False, {}),
+        ("lazy, sync sink", False, False, {}),
+        ("lazy, background sink", False, True, {}),
+        ("lazy, background, 10%", False, True, {"POST /api/v1/quotes": 0.1}),
+    ):
+        settings.log_sample_rates = sample_rates
+        if background:
+            logging_setup.configure_logging()
+        else:
+            # The previous startup_application sinks
+            logger.remove()
+            logger.add(stdout, level="INFO")
+            logger.add(
+                settings.log_file,
+                level="INFO",
+                rotation="10 MB",
+                retention="7 days",
+                compression="zip",
+            )
+
+        app = build_app(eager)
+        await measure(app, requests=min(args.requests, 500), concurrency=args.concurrency)
+        rps, p50, p99 = await measure(app, args.requests, args.concurrency)
+        logging_setup.shutdown_logging()
+        logger.remove()
+        print(f"{name:24} {rps:9.0f} req/s  p50={p50 * 1000:7.2f} ms  p99={p99 * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--stdout-latency-ms", type=float, default=0.05)
+    asyncio.run(main(parser.parse_args()))
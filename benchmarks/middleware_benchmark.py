@@ -0,0 +1,138 @@
+"""
+Requests per second and p99 latency of POST /api/v1/quotes behind the middleware stack,
+with the previous ``BaseHTTPMiddleware`` classes vs. the pure ASGI ones.
+
+The route body is a stand-in that returns a fixed quote, so the numbers isolate
+middleware overhead from the database and Redis.
+
+    python -m benchmarks.middleware_benchmark --requests 20000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+for name, value in {
+    "SECRET_KEY": "benchmark",
+    "DB_USER": "benchmark",
+    "DB_PASSWORD": "benchmark",
+    "DB_NAME": "benchmark",
+    "RATE_LIMIT_REQUESTS": "1000000000",
+}.items():
+    os.environ.setdefault(name, value)
+
+import httpx  # noqa: E402
+from aiocache import SimpleMemoryCache  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from loguru import logger  # noqa: E402
+from starlette import status  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.endpoints.middlewares import ExceptionMiddleware, RateLimitMiddleware  # noqa: E402
+from app.schemas.polis_schema import (  # noqa: E402
+    QuoteCreateRequestSchema,
+    QuoteCreateResponseSchema,
+)
+from app.services.rate_limit_service import RateLimiter  # noqa: E402
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        result = await request.app.state.rate_limiter.hit(
+            f"rate_limit:{request.client.host}",
+            limit=settings.rate_limit_requests,
+            window=settings.rate_limit_time_window,
+        )
+
+        if not result.allowed:
+            return JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={"detail": "Too many requests. Try again later."},
+                headers=result.headers(),
+            )
+
+        response = await call_next(request)
+        response.headers.update(result.headers())
+        return response
+
+
+class LegacyExceptionMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        try:
+            return await call_next(request)
+        except Exception as e:
+            detail = str(e) if settings.app_debug else "Internal server error."
+            return JSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"detail": detail}
+            )
+
+
+def build_app(rate_limit_middleware, exception_middleware) -> FastAPI:
+    app = FastAPI()
+    app.state.rate_limiter = RateLimiter(SimpleMemoryCache())
+
+    @app.post("/api/v1/quotes")
+    async def create_quote(data: QuoteCreateRequestSchema) -> QuoteCreateResponseSchema:
+        return QuoteCreateResponseSchema(
+            **data.model_dump(),
+            id=uuid4(),
+            price=Decimal("1000.00"),
+            created_at=datetime.now(timezone.utc),
+            updated_at=None,
+        )
+
+    app.add_middleware(rate_limit_middleware)
+    app.add_middleware(exception_middleware)
+    return app
+
+
+async def measure(app: FastAPI, requests: int, concurrency: int) -> tuple[float, float, float]:
+    body = {"tariff": "premium", "age": 30, "experience": 3, "car_type": "suv"}
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+    ) as client:
+
+        async def one() -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post("/api/v1/quotes", json=body)
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*[one() for _ in range(requests)])
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p50 = statistics.median(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    return requests / elapsed, p50, p99
+
+
+async def main(args) -> None:
+    logger.remove()
+
+    for name, app in (
+        ("BaseHTTPMiddleware", build_app(LegacyRateLimitMiddleware, LegacyExceptionMiddleware)),
+        ("pure ASGI", build_app(RateLimitMiddleware, ExceptionMiddleware)),
+    ):
+        await measure(app, requests=min(args.requests, 500), concurrency=args.concurrency)
+        rps, p50, p99 = await measure(app, args.requests, args.concurrency)
+        print(f"{name:20} {rps:9.0f} req/s  p50={p50 * 1000:7.2f} ms  p99={p99 * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,126 @@
+"""
+Microbenchmark for the precompiled pricing table.
+
+Checks that ``PricingEngine.price`` returns exactly what the original per-call
+implementation returned over the whole input domain, then compares their speed.
+
+    python -m benchmarks.pricing_benchmark
+"""
+
+import itertools
+import os
+import timeit
+from decimal import Decimal, ROUND_HALF_UP
+
+for name, value in {
+    "SECRET_KEY": "benchmark",
+    "DB_USER": "benchmark",
+    "DB_PASSWORD": "benchmark",
+    "DB_NAME": "benchmark",
+}.items():
+    os.environ.setdefault(name, value)
+
+from app.schemas.polis_schema import CarTypeEnum, QuoteCreateRequestSchema, TariffEnum  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.services.pricing_service import PricingEngine, load_pricing_rules  # noqa: E402
+
+AGES = range(-10, 151)
+EXPERIENCES = range(-10, 101)
+BASE_PRICES = (Decimal("1000"), Decimal("999.99"), Decimal("1234.567"), Decimal("0"))
+RULES = load_pricing_rules(settings.pricing_rules_file)
+
+
+async def reference_price(data: QuoteCreateRequestSchema, base_price: Decimal) -> Decimal:
+    """The original ``QuoteService.calculate_quote_price``, kept verbatim minus logging."""
+    price = base_price
+
+    TARIFF_COEFF = {
+        TariffEnum.standard: Decimal("1.0"),
+        TariffEnum.premium: Decimal("1.5"),
+    }
+
+    def age_coeff(age: int) -> Decimal:
+        if age < 25:
+            return Decimal("1.2")
+
+        elif age > 60:
+            return Decimal("1.1")
+
+        return Decimal("1.0")
+
+    def experience_coeff(exp: int) -> Decimal:
+        if exp < 2:
+            return Decimal("1.3")
+
+        elif exp < 5:
+            return Decimal("1.1")
+
+        return Decimal("1.0")
+
+    CAR_COEFF = {
+        CarTypeEnum.sedan: Decimal("1.0"),
+        CarTypeEnum.suv: Decimal("1.2"),
+        CarTypeEnum.truck: Decimal("1.3"),
+    }
+
+    price *= TARIFF_COEFF[data.tariff]
+    price *= age_coeff(data.age)
+    price *= experience_coeff(data.experience)
+    price *= CAR_COEFF[data.car_type]
+
+    return price.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def run_sync(coro):
+    """Drive a coroutine that never awaits without paying for an event loop."""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("coroutine suspended")
+
+
+def check_equivalence() -> int:
+    """Compare both implementations over the full domain and return the number of cases."""
+    checked = 0
+
+    for base_price in BASE_PRICES:
+        engine = PricingEngine.from_rules(RULES, base_price=base_price)
+
+        for tariff, car_type, age, experience in itertools.product(
+            TariffEnum, CarTypeEnum, AGES, EXPERIENCES
+        ):
+            data = QuoteCreateRequestSchema(
+                tariff=tariff, age=age, experience=experience, car_type=car_type
+            )
+            expected = run_sync(reference_price(data, base_price))
+            actual = engine.price(tariff, age, experience, car_type)
+
+            if str(actual) != str(expected):
+                raise AssertionError(f"{data!r} @ {base_price}: expected {expected}, got {actual}")
+
+            checked += 1
+
+    return checked
+
+
+def run_timings(number: int = 200_000) -> None:
+    base_price = Decimal("1000")
+    engine = PricingEngine.from_rules(RULES, base_price=base_price)
+    data = QuoteCreateRequestSchema(
+        tariff=TariffEnum.premium, age=30, experience=3, car_type=CarTypeEnum.suv
+    )
+
+    reference = timeit.timeit(lambda: run_sync(reference_price(data, base_price)), number=number)
+    compiled = timeit.timeit(
+        lambda: engine.price(data.tariff, data.age, data.experience, data.car_type), number=number
+    )
+
+    print(f"reference: {reference / number * 1e9:10.1f} ns/call")
+    print(f"compiled:  {compiled / number * 1e9:10.1f} ns/call")
+    print(f"speedup:   {reference / compiled:10.1f}x")
+
+
+if __name__ == "__main__":
+    print(f"equivalent on {check_equivalence()} inputs")
+    run_timings()
@@ -0,0 +1,123 @@
+"""
+Redis round trips per rate-limited request: legacy get/set/increment vs. the atomic script.
+
+Fires ``--requests`` hits at one key from ``--concurrency`` concurrent tasks and reports
+Redis commands sent, wall time and how many requests each variant admitted (the legacy
+pattern over-admits under concurrency because its read and write are separate).
+
+``--limit`` defaults to ``--requests`` so every request is admitted: a rejected request
+costs the legacy pattern a single GET, and a run that mostly rejects hides the round trips
+saved on admitted ones. Commands are also reported per admitted request for runs with a
+lower limit.
+
+    python -m benchmarks.rate_limit_benchmark --host localhost --port 6379 --db 15
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+for name, value in {
+    "SECRET_KEY": "benchmark",
+    "DB_USER": "benchmark",
+    "DB_PASSWORD": "benchmark",
+    "DB_NAME": "benchmark",
+}.items():
+    os.environ.setdefault(name, value)
+
+from aiocache import RedisCache  # noqa: E402
+
+from app.services.rate_limit_service import RateLimiter  # noqa: E402
+
+
+class CommandCounter:
+    """Counts commands sent through a redis-py client."""
+
+    def __init__(self, client):
+        self.count = 0
+        original = client.execute_command
+
+        async def execute_command(*args, **kwargs):
+            self.count += 1
+            return await original(*args, **kwargs)
+
+        client.execute_command = execute_command
+
+
+async def legacy_hit(cache, key: str, limit: int, window: int) -> bool:
+    """The previous middleware logic: get, then set or increment."""
+    request_count = await cache.get(key)
+
+    if request_count is None:
+        await cache.set(key, 1, ttl=window)
+    elif int(request_count) >= limit:
+        return False
+    else:
+        await cache.increment(key)
+
+    return True
+
+
+async def run(name: str, hit, cache, counter: CommandCounter, args) -> None:
+    key = f"rate_limit_benchmark:{name}"
+    await cache.delete(key)
+    counter.count = 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one() -> bool:
+        async with semaphore:
+            return await hit(key)
+
+    started = time.perf_counter()
+    admitted = sum(await asyncio.gather(*[one() for _ in range(args.requests)]))
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{name:15} commands/request={counter.count / args.requests:5.2f} "
+        f"commands/admitted={counter.count / max(admitted, 1):5.2f} "
+        f"admitted={admitted:6} (limit {args.limit}) "
+        f"throughput={args.requests / elapsed:9.0f} req/s"
+    )
+    await cache.delete(key)
+
+
+async def main(args) -> None:
+    # One connection per concurrent task, newer redis-py pools cap connections by default
+    cache = RedisCache(
+        endpoint=args.host, port=args.port, db=args.db, pool_max_size=args.concurrency
+    )
+    counter = CommandCounter(cache.client)
+
+    await run(
+        "legacy",
+        lambda key: legacy_hit(cache, key, args.limit, args.window),
+        cache,
+        counter,
+        args,
+    )
+
+    for algorithm in ("sliding_window", "token_bucket"):
+        limiter = RateLimiter(cache, algorithm=algorithm)
+
+        async def hit(key, limiter=limiter):
+            return (await limiter.hit(key, limit=args.limit, window=args.window)).allowed
+
+        await run(algorithm, hit, cache, counter, args)
+
+    await cache.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--db", type=int, default=15)
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--limit", type=int, help="default: --requests, so all are admitted")
+    parser.add_argument("--window", type=int, default=60)
+    args = parser.parse_args()
+    if args.limit is None:
+        args.limit = args.requests
+    asyncio.run(main(args))
@@ -0,0 +1,205 @@
+"""
+Read-replica routing with read-your-writes, checked against two separate databases.
+
+The "replica" is a second, empty database that is never replicated to, so every read that
+lands on it visibly misses. The check drives ``app.main.app`` in-process and verifies that:
+
+* right after a client writes, its reads go to the primary and find what it wrote;
+* once ``DB_READ_YOUR_WRITES_MS`` has passed, the same reads go to the replica;
+* writes never touch the replica.
+
+It then reports how many statements each database served for a burst of reads.
+
+Uses two temporary SQLite files by default, or two empty, disposable databases:
+
+    python -m benchmarks.read_routing_benchmark
+    python -m benchmarks.read_routing_benchmark \\
+        --database-url postgresql+asyncpg://.../primary \\
+        --read-database-url postgresql+asyncpg://.../replica
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+WINDOW_MS = 300
+
+for name, value in {
+    "SECRET_KEY": "benchmark",
+    "DB_USER": "benchmark",
+    "DB_PASSWORD": "benchmark",
+    "DB_NAME": "benchmark",
+    # Any host turns the replica on; the engines are rebound to the databases below
+    "DB_READ_HOST": "replica",
+    "DB_READ_YOUR_WRITES_MS": str(WINDOW_MS),
+    "RATE_LIMIT_REQUESTS": "1000000000",
+}.items():
+    os.environ.setdefault(name, value)
+
+import httpx  # noqa: E402
+from aiocache import SimpleMemoryCache  # noqa: E402
+from loguru import logger  # noqa: E402
+
+logger.remove()
+logger.add(sys.stderr, level="ERROR")
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+from app.db.models import application_model, quote_model, user_model  # noqa: E402, F401
+from app.db.session import Base, ReadSessionLocal, SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.principal_cache_service import principal_cache  # noqa: E402
+from app.services.rate_limit_service import RateLimiter  # noqa: E402
+
+API = "/api/v1"
+PASSWORD = "benchmark-password"
+QUOTE_BODY = {"tariff": "premium", "age": 30, "experience": 3, "car_type": "suv"}
+READS = 200
+
+
+@contextmanager
+def count_statements(engine):
+    """Count the statements the engine runs while the block is active."""
+    counter = {"statements": 0}
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        counter["statements"] += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield counter
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+def check(condition: bool, message: str) -> None:
+    print(f"{'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        sys.exit(1)
+
+
+async def run(args) -> None:
+    tmp = tempfile.mkdtemp(prefix="read-routing-")
+    primary_url = args.database_url or f"sqlite+aiosqlite:///{tmp}/primary.db"
+    replica_url = args.read_database_url or f"sqlite+aiosqlite:///{tmp}/replica.db"
+
+    primary = create_async_engine(primary_url)
+    replica = create_async_engine(replica_url)
+    SessionLocal.configure(bind=primary)
+    ReadSessionLocal.configure(bind=replica)
+
+    for engine in (primary, replica):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    app.state.cache = SimpleMemoryCache()
+    app.state.rate_limiter = RateLimiter(app.state.cache)
+    app.state.db_engine = primary
+
+    transport = httpx.ASGITransport(app=app, client=("10.0.0.1", 0))
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        with count_statements(primary) as on_primary, count_statements(replica) as on_replica:
+            registered = await client.post(
+                f"{API}/auth/register",
+                json={
+                    "username": "replica-check",
+                    "full_name": "Replica Check",
+                    "password": PASSWORD,
+                    "password_confirm": PASSWORD,
+                },
+            )
+            token = registered.json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            check(on_replica["statements"] == 0, "register wrote to the primary only")
+
+            me = await client.post(f"{API}/users/me", headers=headers)
+            check(me.status_code == 200, "user lookup right after registering uses the primary")
+
+            quote = (await client.post(f"{API}/quotes", json=QUOTE_BODY)).json()
+            await app.state.cache.clear()
+            fetched = await client.get(f"{API}/quotes/{quote['id']}")
+            check(fetched.status_code == 200, "quote read right after creating it uses the primary")
+            check(on_replica["statements"] == 0, "nothing reached the replica inside the window")
+
+            await asyncio.sleep(WINDOW_MS / 1000 * 1.5)
+
+            principal_cache.invalidate_user("replica-check")
+            me = await client.post(f"{API}/users/me", headers=headers)
+            check(me.status_code == 401, "user lookup after the window uses the replica")
+
+            await app.state.cache.clear()
+            fetched = await client.get(f"{API}/quotes/{quote['id']}")
+            check(fetched.status_code == 404, "quote read after the window uses the replica")
+
+            login = await client.post(
+                f"{API}/auth/login", json={"username": "replica-check", "password": PASSWORD}
+            )
+            await app.state.cache.clear()
+            fetched = await client.get(f"{API}/quotes/{quote['id']}")
+            check(
+                login.status_code == 200 and fetched.status_code == 404,
+                "logging in does not pin the client to the primary",
+            )
+
+            neighbour = await client.post(
+                f"{API}/auth/register",
+                json={
+                    "username": "replica-neighbour",
+                    "full_name": "Replica Neighbour",
+                    "password": PASSWORD,
+                    "password_confirm": PASSWORD,
+                },
+            )
+            neighbour_headers = {"Authorization": f"Bearer {neighbour.json()['access_token']}"}
+            await asyncio.sleep(WINDOW_MS / 1000 * 1.5)
+
+            # Same address for all three clients below
+            quote = (await client.post(f"{API}/quotes", json=QUOTE_BODY, headers=headers)).json()
+            await app.state.cache.clear()
+            fetched = await client.get(f"{API}/quotes/{quote['id']}", headers=headers)
+            check(fetched.status_code == 200, "the writer's own reads use the primary")
+
+            me = await client.post(f"{API}/users/me", headers=neighbour_headers)
+            check(me.status_code == 401, "another user at the same address reads the replica")
+
+            await app.state.cache.clear()
+            fetched = await client.get(f"{API}/quotes/{quote['id']}")
+            check(fetched.status_code == 404, "anonymous reads from that address use the replica")
+
+        with count_statements(primary) as on_primary, count_statements(replica) as on_replica:
+            for i in range(READS):
+                # The quote routes are rate limited per address
+                transport.client = (f"10.1.{i >> 8 & 255}.{i & 255}", 0)
+                await app.state.cache.clear()
+                await client.get(f"{API}/quotes/{quote['id']}")
+
+        print(
+            f"{READS} cache-missing quote reads: {on_primary['statements']} statements on the "
+            f"primary, {on_replica['statements']} on the replica"
+        )
+
+    for engine in (primary, replica):
+        if args.database_url:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", help="empty, disposable primary database")
+    parser.add_argument("--read-database-url", help="empty, disposable replica database")
+    args = parser.parse_args()
+
+    if bool(args.database_url) != bool(args.read_database_url):
+        parser.error("pass both --database-url and --read-database-url, or neither")
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
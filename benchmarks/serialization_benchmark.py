@@ -0,0 +1,191 @@
+"""
+Microbenchmark for building and encoding quote and application responses.
+
+Checks that the new pipeline produces byte-for-byte the JSON the original one did, for a
+quote, an application and a page of applications, then compares per-response cost:
+
+* original: copy ORM fields into a validated schema, then let FastAPI validate it again
+  against the route's return annotation and encode it;
+* original, custom response class: the same, but FastAPI falls back to ``jsonable_encoder``
+  plus ``json.dumps``, which is what any non-default response class used to cost;
+* new: ``from_row`` (built once; applications skip their email and phone validators) and
+  ``ModelResponse`` (pydantic-core straight to bytes, no second validation).
+
+It also compares stdlib ``json`` with orjson (``FastJSONResponse``) for a plain dict.
+
+    python -m benchmarks.serialization_benchmark
+"""
+
+import json
+import os
+import timeit
+import warnings
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+for name, value in {
+    "SECRET_KEY": "benchmark",
+    "DB_USER": "benchmark",
+    "DB_PASSWORD": "benchmark",
+    "DB_NAME": "benchmark",
+}.items():
+    os.environ.setdefault(name, value)
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from starlette.responses import JSONResponse, Response  # noqa: E402
+
+from app.core.responses import FastJSONResponse, ModelResponse  # noqa: E402
+from app.db.models.application_model import Application  # noqa: E402
+from app.db.models.quote_model import Quote  # noqa: E402
+from app.db.models.user_model import User  # noqa: E402
+from app.schemas.auth_schema import UserResponseSchema  # noqa: E402
+from app.schemas.polis_schema import (  # noqa: E402
+    ApplicationCreateResponseSchema,
+    ApplicationListResponseSchema,
+    ApplicationStatusEnum,
+    CarTypeEnum,
+    QuoteCreateResponseSchema,
+    TariffEnum,
+)
+
+PAGE = 20
+NUMBER = 2000
+
+
+def make_rows() -> tuple[Quote, list[Application]]:
+    now = datetime.now(timezone.utc)
+    owner = User(id=uuid4(), full_name="Benchmark User", username="benchmark", password="x")
+    quote = Quote(
+        id=uuid4(),
+        tariff=TariffEnum.premium,
+        age=30,
+        experience=3,
+        car_type=CarTypeEnum.suv,
+        price=Decimal("1800.00"),
+        rule_version="1",
+        created_at=now,
+        updated_at=None,
+    )
+    applications = [
+        Application(
+            id=uuid4(),
+            full_name=f"Benchmark User {i}",
+            phone="+998901234567",
+            email=f"benchmark{i}@example.com",
+            tariff=TariffEnum.premium,
+            quote=quote,
+            owner=owner,
+            status=ApplicationStatusEnum.new,
+            created_at=now,
+            updated_at=None,
+        )
+        for i in range(PAGE)
+    ]
+    return quote, applications
+
+
+# --- the original pipeline, kept verbatim minus logging ---
+def original_quote(quote: Quote) -> QuoteCreateResponseSchema:
+    return QuoteCreateResponseSchema(
+        id=quote.id,
+        tariff=quote.tariff,
+        age=quote.age,
+        experience=quote.experience,
+        car_type=quote.car_type,
+        price=quote.price,
+        rule_version=quote.rule_version,
+        created_at=quote.created_at,
+        updated_at=quote.updated_at,
+    )
+
+
+def original_application(application: Application) -> ApplicationCreateResponseSchema:
+    return ApplicationCreateResponseSchema.model_validate(application, from_attributes=True)
+
+
+def original_page(applications: list[Application]) -> ApplicationListResponseSchema:
+    return ApplicationListResponseSchema(
+        items=[original_application(application) for application in applications],
+        next_cursor="cursor",
+    )
+
+
+def fastapi_encode(adapter: TypeAdapter, model) -> bytes:
+    """What FastAPI does with a returned model: validate it, then dump JSON."""
+    content = adapter.dump_json(adapter.validate_python(model))
+    return Response(content=content, media_type="application/json").body
+
+
+def legacy_encode(adapter: TypeAdapter, model) -> bytes:
+    """What FastAPI does with a custom response class: validate, jsonable_encoder, json.dumps."""
+    content = jsonable_encoder(adapter.dump_python(adapter.validate_python(model), mode="json"))
+    return JSONResponse(content).body
+
+
+def main() -> None:
+    quote, applications = make_rows()
+    owner = applications[0].owner
+    cases = {
+        "quote": (
+            lambda: original_quote(quote),
+            lambda: QuoteCreateResponseSchema.from_row(quote),
+            TypeAdapter(QuoteCreateResponseSchema),
+        ),
+        "application": (
+            lambda: original_application(applications[0]),
+            lambda: ApplicationCreateResponseSchema.from_row(applications[0]),
+            TypeAdapter(ApplicationCreateResponseSchema),
+        ),
+        f"application page ({PAGE})": (
+            lambda: original_page(applications),
+            lambda: ApplicationListResponseSchema.model_construct(
+                items=[ApplicationCreateResponseSchema.from_row(row) for row in applications],
+                next_cursor="cursor",
+            ),
+            TypeAdapter(ApplicationListResponseSchema),
+        ),
+    }
+
+    with warnings.catch_warnings():
+        # pydantic warns when a constructed model holds a value of the wrong type
+        warnings.simplefilter("error")
+        for label, (build_original, build_new, adapter) in cases.items():
+            expected = fastapi_encode(adapter, build_original())
+            assert ModelResponse(build_new()).body == expected, label
+            assert (
+                legacy_encode(adapter, build_original()) == JSONResponse(json.loads(expected)).body
+            ), label
+        user = UserResponseSchema.from_row(owner)
+        assert (
+            ModelResponse(user).body
+            == UserResponseSchema.model_validate(owner, from_attributes=True)
+            .model_dump_json()
+            .encode()
+        )
+    print("quote, application and page responses encode identically")
+
+    def per_call(fn) -> float:
+        return min(timeit.repeat(fn, number=NUMBER, repeat=3)) / NUMBER * 1e6
+
+    for label, (build_original, build_new, adapter) in cases.items():
+        original = per_call(lambda: fastapi_encode(adapter, build_original()))
+        legacy = per_call(lambda: legacy_encode(adapter, build_original()))
+        new = per_call(lambda: ModelResponse(build_new()).body)
+        print(
+            f"{label:24} original {original:8.2f} us   custom class {legacy:8.2f} us   "
+            f"new {new:8.2f} us  ({original / new:.1f}x)"
+        )
+
+    stats = {
+        f"component_{i}": {"hits": i, "misses": i * 2, "size": 4096, "avg_ms": i / 7}
+        for i in range(50)
+    }
+    stdlib = per_call(lambda: JSONResponse(stats).body)
+    fast = per_call(lambda: FastJSONResponse(stats).body)
+    print(f"{'plain dict (50 keys)':24} json {stdlib:8.2f} us   orjson {fast:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Throughput of ``python -m app`` for different worker counts.
+
+Starts the launcher once per worker count, waits until it answers, then drives ``--path``
+from several client processes for ``--duration`` seconds. Needs the database and Redis
+configured in the environment or ``.env``.
+
+    python -m benchmarks.server_benchmark --workers 1 2 4 --clients 4 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+async def _drive(url: str, concurrency: int, duration: float) -> list[float]:
+    latencies: list[float] = []
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    ) as client:
+
+        async def user() -> None:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await client.get(url)
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+
+    return latencies
+
+
+def _client(args: tuple) -> list[float]:
+    return asyncio.run(_drive(*args))
+
+
+def _wait_ready(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"Server did not answer on {url}")
+
+
+def measure(workers: int, args) -> dict:
+    env = {
+        **os.environ,
+        "APP_WORKERS": str(workers),
+        "APP_PORT": str(args.port),
+        "LOG_LEVEL": "WARNING",
+        "LOG_FILE": "",
+        "RATE_LIMIT_REQUESTS": "1000000000",
+    }
+    server = subprocess.Popen([sys.executable, "-m", "app"], env=env)
+    url = f"http://127.0.0.1:{args.port}{args.path}"
+
+    try:
+        _wait_ready(url)
+        per_client = max(1, args.concurrency // args.clients)
+        with multiprocessing.Pool(args.clients) as pool:
+            results = pool.map(_client, [(url, per_client, args.duration)] * args.clients)
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+    latencies = sorted(latency for result in results for latency in result)
+    return {
+        "rps": len(latencies) / args.duration,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--path", default="/api/v1/metrics")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, {args.concurrency} connections, GET {args.path}")
+    print(f"{'workers':>8}{'req/s':>10}{'p50_ms':>10}{'p99_ms':>10}")
+    for workers in args.workers:
+        result = measure(workers, args)
+        print(
+            f"{workers:>8}{result['rps']:>10.0f}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Cold import and startup time of one worker, per DB_STARTUP_MODE.
+
+Each run is a fresh interpreter that imports ``app.main`` and runs ``startup_application``
+against the database configured in the environment or ``.env``, which must be migrated to
+head for ``check_revision``. Redis is not contacted at startup.
+
+    python -m benchmarks.startup_benchmark --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+WORKER = """
+import asyncio, json, time
+started = time.perf_counter()
+from app.main import app
+from app.core.metrics import startup_timings
+from app.utils import shutdown_application, startup_application
+
+asyncio.run(startup_application(app))
+ready = (time.perf_counter() - started) * 1000
+asyncio.run(shutdown_application(app))
+print(json.dumps({**startup_timings, "ready_ms": ready}))
+"""
+
+MODES = ("check_revision", "create_all")
+
+
+def run_worker(mode: str) -> dict:
+    env = {**os.environ, "DB_STARTUP_MODE": mode, "LOG_FILE": "", "LOG_LEVEL": "WARNING"}
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", WORKER], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    timings = json.loads(output.strip().splitlines()[-1])
+    timings["process_ms"] = (time.perf_counter() - started) * 1000
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--mode", choices=MODES, action="append")
+    args = parser.parse_args()
+
+    print(f"{'mode':16}{'import_ms':>12}{'startup_ms':>12}{'ready_ms':>12}{'process_ms':>12}")
+    for mode in args.mode or MODES:
+        runs = [run_worker(mode) for _ in range(args.runs)]
+        medians = {
+            key: statistics.median(run[key] for run in runs)
+            for key in ("import_ms", "startup_ms", "ready_ms", "process_ms")
+        }
+        print(f"{mode:16}" + "".join(f"{value:12.1f}" for value in medians.values()))
+
+
+if __name__ == "__main__":
+    main()
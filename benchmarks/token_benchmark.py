@@ -0,0 +1,99 @@
+"""
+Microbenchmark for JWT verification.
+
+Checks that ``TokenVerifier.decode`` returns exactly what a plain ``jose.jwt.decode`` with
+the secret string returned, and rejects the same tampered and expired tokens, then compares:
+
+* the original call: ``jwt.decode(token, settings.secret_key, ...)`` on every request;
+* a verifier with the prepared key but an empty cache (every token seen for the first time);
+* a verifier answering from its cache of verified tokens.
+
+    python -m benchmarks.token_benchmark
+"""
+
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+for name, value in {
+    "SECRET_KEY": "benchmark",
+    "DB_USER": "benchmark",
+    "DB_PASSWORD": "benchmark",
+    "DB_NAME": "benchmark",
+}.items():
+    os.environ.setdefault(name, value)
+
+from loguru import logger  # noqa: E402
+
+logger.remove()
+logger.add(sys.stderr, level="WARNING")
+
+from jose import JWTError, jwt  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.services.security_service import TokenVerifier  # noqa: E402
+
+TOKENS = 1000
+NUMBER = 5
+
+
+def reference_decode(token: str) -> dict | None:
+    """The original ``SecurityService.decode_token``, minus logging."""
+    try:
+        return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    except JWTError:
+        return None
+
+
+def make_token(sub: str, expires_delta: timedelta) -> str:
+    return jwt.encode(
+        {"sub": sub, "exp": datetime.now() + expires_delta},
+        settings.secret_key,
+        algorithm=settings.algorithm,
+    )
+
+
+def main() -> None:
+    tokens = [make_token(f"user{i}", timedelta(minutes=30)) for i in range(TOKENS)]
+    invalid = [
+        tokens[0][:-2] + ("AA" if not tokens[0].endswith("AA") else "BB"),
+        make_token("expired", timedelta(minutes=-5)),
+        jwt.encode({"sub": "other", "exp": datetime.now() + timedelta(minutes=5)}, "other-key"),
+        "not-a-token",
+    ]
+
+    verifier = TokenVerifier(settings.secret_key, settings.algorithm, maxsize=TOKENS)
+    for token in tokens + invalid:
+        expected = reference_decode(token)
+        assert verifier.decode(token) == expected, token  # first sight, verified
+        assert verifier.decode(token) == expected, token  # second sight, cached if valid
+    print(f"{TOKENS} valid and {len(invalid)} invalid tokens decode identically")
+
+    def per_call(fn) -> float:
+        return min(timeit.repeat(fn, number=NUMBER, repeat=3)) / (NUMBER * TOKENS) * 1e6
+
+    def original():
+        for token in tokens:
+            reference_decode(token)
+
+    # maxsize=0 evicts every entry as it is stored, so each decode pays for verification
+    uncached = TokenVerifier(settings.secret_key, settings.algorithm, maxsize=0)
+
+    def prepared_key():
+        for token in tokens:
+            uncached.decode(token)
+
+    def cached():
+        for token in tokens:
+            verifier.decode(token)
+
+    baseline = per_call(original)
+    print(f"jwt.decode with the secret string   {baseline:8.2f} us/token")
+    for label, fn in (("prepared key, cache miss", prepared_key), ("cache hit", cached)):
+        took = per_call(fn)
+        print(f"{label:35} {took:8.2f} us/token  ({baseline / took:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Statement count of the write endpoints.
+
+Drives ``app.main.app`` in-process and checks, with a ``before_cursor_execute`` counter,
+that each write sends exactly the statements below and nothing else. A repository that
+goes back to INSERT + refresh SELECT, or to looking the quote up before inserting an
+application, fails the check:
+
+* ``POST /auth/register``: the username check, then one INSERT ... RETURNING;
+* ``POST /quotes``: one INSERT ... RETURNING;
+* ``POST /quotes/batch``: one multi-row INSERT ... RETURNING;
+* ``POST /applications``: one INSERT ... SELECT ... RETURNING (Postgres only).
+
+Uses a temporary SQLite file by default, or any empty, disposable database. SQLite cannot
+run the data-modifying CTE behind ``POST /applications``, so that check needs Postgres:
+
+    python -m benchmarks.write_statement_benchmark
+    python -m benchmarks.write_statement_benchmark --database-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+for name, value in {
+    "SECRET_KEY": "benchmark",
+    "DB_USER": "benchmark",
+    "DB_PASSWORD": "benchmark",
+    "DB_NAME": "benchmark",
+    "RATE_LIMIT_REQUESTS": "1000000000",
+    "QUOTE_WRITE_MODE": "sync",
+}.items():
+    os.environ.setdefault(name, value)
+
+import httpx  # noqa: E402
+from aiocache import SimpleMemoryCache  # noqa: E402
+from loguru import logger  # noqa: E402
+
+logger.remove()
+logger.add(sys.stderr, level="WARNING")
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+from app.db.models import application_model, quote_model, user_model  # noqa: E402, F401
+from app.db.session import Base, ReadSessionLocal, SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.rate_limit_service import RateLimiter  # noqa: E402
+
+API = "/api/v1"
+PASSWORD = "benchmark-password"
+QUOTE_BODY = {"tariff": "premium", "age": 30, "experience": 3, "car_type": "suv"}
+BATCH_SIZE = 100
+
+
+@contextmanager
+def count_statements(engine):
+    """Collect every statement the engine sends while the block runs."""
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+def check(label: str, statements: list[str], expected: list[str]) -> None:
+    """Fail unless the statements match ``expected`` one for one, by leading keyword."""
+    kinds = [statement.lstrip().split(None, 1)[0].upper() for statement in statements]
+    if kinds != expected:
+        listing = "\n".join(f"    {statement}" for statement in statements)
+        raise AssertionError(f"{label}: expected {expected}, got {kinds}:\n{listing}")
+    if any("RETURNING" not in statement for statement in statements if "INSERT" in statement):
+        raise AssertionError(f"{label}: the INSERT has no RETURNING")
+    print(f"{label:26} {len(statements)} statement(s): {' + '.join(kinds)}")
+
+
+async def run(args) -> None:
+    tmp = tempfile.mkdtemp(prefix="write-statements-")
+    url = args.database_url or f"sqlite+aiosqlite:///{tmp}/writes.db"
+    postgres = url.startswith("postgresql")
+
+    engine = create_async_engine(url)
+    SessionLocal.configure(bind=engine)
+    ReadSessionLocal.configure(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    app.state.cache = SimpleMemoryCache()
+    app.state.rate_limiter = RateLimiter(app.state.cache)
+    app.state.db_engine = engine
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+
+        async def post(path: str, **kwargs) -> httpx.Response:
+            response = await client.post(f"{API}{path}", **kwargs)
+            if response.status_code != 200:
+                raise AssertionError(f"POST {path}: {response.status_code} {response.text}")
+            return response
+
+        with count_statements(engine) as statements:
+            registered = await post(
+                "/auth/register",
+                json={
+                    "username": "statements",
+                    "full_name": "Statement Count",
+                    "password": PASSWORD,
+                    "password_confirm": PASSWORD,
+                },
+            )
+        check("POST /auth/register", statements, ["SELECT", "INSERT"])
+
+        with count_statements(engine) as statements:
+            quote = (await post("/quotes", json=QUOTE_BODY)).json()
+        check("POST /quotes", statements, ["INSERT"])
+
+        with count_statements(engine) as statements:
+            await post("/quotes/batch", json={"items": [QUOTE_BODY] * BATCH_SIZE})
+        check(f"POST /quotes/batch ({BATCH_SIZE})", statements, ["INSERT"])
+
+        if postgres:
+            headers = {"Authorization": f"Bearer {registered.json()['access_token']}"}
+            # Put the principal in its cache so only the application's own statements count
+            await post("/users/me", headers=headers)
+            body = {
+                "full_name": "Statement Count",
+                "phone": "+998901234567",
+                "email": "statements@example.com",
+                "tariff": "premium",
+                "quote_id": quote["id"],
+            }
+
+            with count_statements(engine) as statements:
+                await post("/applications", json=body, headers=headers)
+            check("POST /applications", statements, ["WITH"])
+        else:
+            print(f"{'POST /applications':26} skipped on SQLite, pass a Postgres --database-url")
+
+    if args.database_url:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", help="empty, disposable database")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()